@@ -56,7 +56,7 @@ warnings.filterwarnings("ignore")
 # ==============================================================================
 
 
-def Li(x: float) -> float:
+def Li(x):
     """
     Logarithmic Integral Function: Propagator Core (Riemann Framework)
 
@@ -65,17 +65,14 @@ def Li(x: float) -> float:
     Asymptotic: Li(x) ~ x/ln(x) as x → ∞ (slowing phase velocity)
 
     Args:
-        x: Position parameter (x > 1 for non-zero values)
+        x: Position parameter (x > 1 for non-zero values), scalar or array
 
     Returns:
-        float: Propagator phase value
+        float or np.ndarray: Propagator phase value (arrays in one vectorized call)
     """
-    if x <= 1:
-        return 0.0
-    try:
-        return float(expi(np.log(x)))
-    except (ValueError, OverflowError):
-        return 0.0
+    x = np.asarray(x, dtype=float)
+    values = np.where(x > 1, expi(np.log(np.where(x > 1, x, 2.0))), 0.0)
+    return float(values) if values.ndim == 0 else values
 
 
 def clamp_to_axis(value: float, target: float = 0.0, strength: float = 0.6) -> float:
@@ -282,6 +279,12 @@ class AMQS_Millennium:
         self.use_leech = use_leech
         self.current_step = 0
 
+        # Li phase table: step k, layer i uses x = k + 2 + 0.5 i
+        # (layer offset for (p,q) distinction)
+        self.li_phases = Li(
+            np.arange(step_budget)[:, None] + 2 + 0.5 * np.arange(n_layers)
+        )
+
         # Hilbert space dimension (qubit encoding)
         self.n_qubits = max(2, int(np.log2(dimension)) + 1)
         self.N = 2**self.n_qubits
@@ -367,10 +370,7 @@ class AMQS_Millennium:
         gen = sum(c * g for c, g in zip(coeffs, self.generators))
 
         # Li(x) modulation (deterministic phase skeleton)
-        x = float(
-            self.current_step + 2 + layer_idx * 0.5
-        )  # Layer offset for (p,q) distinction
-        li_phase = Li(x)
+        li_phase = float(self.li_phases[self.current_step, layer_idx])
         gen = gen * (li_phase * 0.03)
 
         # Antisymmetrize (preserve symplectic structure)
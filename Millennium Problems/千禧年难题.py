@@ -33,7 +33,7 @@ warnings.filterwarnings('ignore')
 # I. 物理工具函数
 # ==============================================================================
 
-def Li(x: float) -> float:
+def Li(x):
     """
     对数积分函数：传播子核心（黎曼框架）
     
@@ -42,17 +42,14 @@ def Li(x: float) -> float:
     渐近行为：当 x → ∞ 时，Li(x) ~ x/ln(x)（相位速度减缓）
     
     参数：
-        x: 位置参数（x > 1 时非零）
+        x: 位置参数（x > 1 时非零），标量或数组
         
     返回：
-        float: 传播子相位值
+        float 或 np.ndarray: 传播子相位值（数组整批向量化求值）
     """
-    if x <= 1:
-        return 0.0
-    try:
-        return float(expi(np.log(x)))
-    except (ValueError, OverflowError):
-        return 0.0
+    x = np.asarray(x, dtype=float)
+    values = np.where(x > 1, expi(np.log(np.where(x > 1, x, 2.0))), 0.0)
+    return float(values) if values.ndim == 0 else values
 
 def 向轴心钳制(value: float, target: float = 0.0, strength: float = 0.6) -> float:
     """
@@ -241,6 +238,11 @@ class AMQS_千禧年:
         self.use_leech = use_leech
         self.current_step = 0
         
+        # Li相位表：第k步第i层取 x = k + 2 + 0.5i（层偏移以区分(p,q)），整批预计算
+        self.li_phases = Li(
+            np.arange(step_budget)[:, None] + 2 + 0.5 * np.arange(n_layers)
+        )
+        
         # 希尔伯特空间维度（量子比特编码）
         self.n_qubits = max(2, int(np.log2(dimension)) + 1)
         self.N = 2 ** self.n_qubits
@@ -320,8 +322,7 @@ class AMQS_千禧年:
         gen = sum(c * g for c, g in zip(coeffs, self.generators))
         
         # Li(x)调制（确定性相位骨架）
-        x = float(self.current_step + 2 + layer_idx * 0.5)  # 层偏移以区分(p,q)
-        li_phase = Li(x)
+        li_phase = float(self.li_phases[self.current_step, layer_idx])
         gen = gen * (li_phase * 0.03)
         
         # 反对称化（保持辛结构）
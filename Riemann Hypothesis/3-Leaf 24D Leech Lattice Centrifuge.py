@@ -42,6 +42,9 @@ matplotlib.use('Agg')
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "math"))
+from 快速素数筛选 import scan_prime_patterns
+
 # Create save directory
 SAVE_DIR = "/storage/emulated/0/研究报告/宇宙/"
 os.makedirs(SAVE_DIR, exist_ok=True)
@@ -64,30 +67,11 @@ print("-" * 60)
 
 # ==================== 1. Basic Algorithms ====================
 
-def sieve_primes(n):
-    """Sieve of Eratosthenes"""
-    if n < 2:
-        return []
-    sieve = [True] * (n + 1)
-    sieve[0] = sieve[1] = False
-    for i in range(2, int(n**0.5) + 1):
-        if sieve[i]:
-            sieve[i*i:n+1:i] = [False] * len(sieve[i*i:n+1:i])
-    return [i for i in range(2, n + 1) if sieve[i]]
-
 def get_prime_triplets(n_max):
-    """Get Prime Triplets"""
-    primes = sieve_primes(n_max)
-    prime_set = set(primes)
-    triplets = []
-    for p in primes:
-        if p > n_max - 6:
-            break
-        if (p+2) in prime_set and (p+6) in prime_set:
-            triplets.append((p, p+2, p+6))
-        elif (p+4) in prime_set and (p+6) in prime_set:
-            triplets.append((p, p+4, p+6))
-    return triplets
+    """Get Prime Triplets (shifted-AND scan over segmented prime bitmaps)"""
+    shapes = {"a": (0, 2, 6), "b": (0, 4, 6)}
+    scan = scan_prime_patterns(2, n_max, shapes, samples=None)
+    return sorted(scan["samples"]["a"] + scan["samples"]["b"])
 
 # Generate data
 print("Generating prime data...")
@@ -26,23 +26,15 @@ GUE Polished Riemann Zero Generation
 import numpy as np
 from scipy.special import lambertw
 import matplotlib.pyplot as plt
+from 零点数据 import read_zero_table
 
 plt.rcParams["font.sans-serif"] = ["SimHei", "DejaVu Sans"]
 plt.rcParams["axes.unicode_minus"] = False
 
 
 def read_zeros(filename):
-    """读取黎曼零点数据文件"""
-    zeros = []
-    with open(filename, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                try:
-                    zeros.append(float(line))
-                except ValueError:
-                    continue
-    return np.array(zeros)
+    """读取黎曼零点数据文件（Odlyzko格式，np.loadtxt整体解析）"""
+    return read_zero_table(filename)
 
 
 def forward_iteration(seed, n_steps):
@@ -33,35 +33,25 @@
 ================================================================================
 """
 
+import os
+import sys
 import numpy as np
 import math
-import mpmath
 from scipy import stats
 from typing import List, Tuple, Dict
 import matplotlib.pyplot as plt
 
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "math")
+)
+from 快速素数筛选 import load_prime_table, psi_prefix_table, psi_samples
+from 零点数据 import ZeroProvider
+from 频谱分析 import detect_peaks, nearest_peaks
 
-def generate_primes(limit: int) -> List[int]:
-    """素数筛"""
-    sieve = bytearray(b"\x01") * (limit + 1)
-    sieve[0:2] = b"\x00\x00"
-    for i in range(2, int(math.sqrt(limit)) + 1):
-        if sieve[i]:
-            sieve[i * i : limit + 1 : i] = b"\x00" * ((limit - i * i) // i + 1)
-    return [i for i in range(2, limit + 1) if sieve[i]]
 
-
-def psi_function(x: int, primes: List[int]) -> float:
-    """计算第二Chebyshev函数 ψ(x) = ∑_{n≤x} Λ(n)"""
-    total = 0.0
-    for p in primes:
-        if p > x:
-            break
-        pk = p
-        while pk <= x:
-            total += math.log(p)
-            pk *= p
-    return total
+def generate_primes(limit: int) -> np.ndarray:
+    """素数表（读取磁盘mmap缓存的 uint32 数组，首次运行时构建）"""
+    return load_prime_table(limit)
 
 
 class RiemannVerification:
@@ -79,9 +69,7 @@ class RiemannVerification:
         self.delta_f = 1.0 / self.T  # Heisenberg极限
 
         # 理论零点（前100个）
-        self.gamma_vals = [
-            float(complex(mpmath.zetazero(n)).imag) for n in range(1, 101)
-        ]
+        self.gamma_vals = ZeroProvider().first(100).tolist()
         self.theory_freqs = [g / (2 * math.pi) for g in self.gamma_vals]
 
         # 理论振幅（用于信噪比预测）
@@ -106,17 +94,13 @@ class RiemannVerification:
         )
         delta_t = t_vals[1] - t_vals[0]
 
-        # 计算 ψ(x) - x（显式公式的振荡部分）
-        oscillation = np.zeros(self.num_samples)
-        for i, t in enumerate(t_vals):
-            x = int(np.exp(t))
-            if x > self.max_x:
-                x = self.max_x
-
-            psi_x = psi_function(x, primes)
-            # 严格对应显式公式的振荡项: (ψ(x) - x)/√x
-            if x > 0:
-                oscillation[i] = (psi_x - x) / math.sqrt(x)
+        # 计算 ψ(x) - x（显式公式的振荡部分）：Λ 前缀表只建一次，各采样点二分查表
+        x_vals = np.minimum(np.exp(t_vals).astype(np.int64), self.max_x)
+        psi_x = psi_samples(x_vals, *psi_prefix_table(primes, self.max_x))
+        # 严格对应显式公式的振荡项: (ψ(x) - x)/√x
+        oscillation = np.where(
+            x_vals > 0, (psi_x - x_vals) / np.sqrt(np.maximum(x_vals, 1)), 0.0
+        )
 
         # 去均值（消除直流分量）
         oscillation = oscillation - np.mean(oscillation)
@@ -147,19 +131,12 @@ class RiemannVerification:
         spectrum = np.abs(fft_result[pos_mask])
 
         # 峰值检测（局部极大值，间距>Δf）
-        peaks = []
-        for i in range(1, len(spectrum) - 1):
-            if spectrum[i] > spectrum[i - 1] and spectrum[i] > spectrum[i + 1]:
-                freq = float(frequencies[i])
-                amp = float(spectrum[i])
-                # Heisenberg极限作为最小间距（物理严格）
-                if not any(abs(p[0] - freq) < self.delta_f for p in peaks):
-                    peaks.append((freq, amp))
+        # Heisenberg极限作为最小间距（物理严格），冲突时先到者保留
+        idx = detect_peaks(spectrum, frequencies, self.delta_f, replace=False)
 
         # 按幅度排序取前120个（>100允许噪声），再按频率排序
-        peaks.sort(key=lambda x: x[1], reverse=True)
-        peaks = peaks[:120]
-        peaks.sort(key=lambda x: x[0])
+        idx = np.sort(idx[np.argsort(-spectrum[idx], kind="stable")[:120]])
+        peaks = [(float(frequencies[i]), float(spectrum[i])) for i in idx]
 
         print(f"检测到 {len(peaks)} 个显著频谱峰")
         return {"peaks": peaks, "frequencies": frequencies, "spectrum": spectrum}
@@ -173,16 +150,13 @@ class RiemannVerification:
         matches = []
         unmatched = []
 
-        # 对每个理论零点，找最佳匹配
+        # 对每个理论零点，二分查找最近的检测峰
+        best_idx, best_dists = nearest_peaks(
+            [p[0] for p in detected_peaks], self.theory_freqs
+        )
         for i, (f_theory, gamma) in enumerate(zip(self.theory_freqs, self.gamma_vals)):
-            best_dist = float("inf")
-            best_peak = None
-
-            for peak in detected_peaks:
-                dist = abs(peak[0] - f_theory)
-                if dist < best_dist:
-                    best_dist = dist
-                    best_peak = peak
+            best_dist = float(best_dists[i])
+            best_peak = detected_peaks[best_idx[i]] if best_idx[i] >= 0 else None
 
             if best_dist < self.delta_f:
                 matches.append(
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+黎曼零点数据源：磁盘缓存 + Odlyzko表批量导入 + 多进程补算
+================================================================================
+
+γ_n（第n个非平凡零点 ρ_n = ½ + iγ_n 的虚部）统一由 ZeroProvider 提供：
+
+1. 缓存：float64 数组存为 .npy，第 n-1 项为 γ_n，未知项为 NaN；
+   读取以 np.load(mmap_mode='r') 打开，已缓存区间零拷贝返回。
+2. 导入：Odlyzko 格式文本表（每行一个γ，或"序号 γ"两列，# 为注释）
+   由 np.loadtxt 整体解析后一次写入缓存。
+3. 补算：缓存中缺失的项用 mpmath.zetazero 在进程池中并行计算。
+缓存更新先读入现有缓存、合并后写临时文件再原子替换：读者总能看到完整文件；
+多个写者并发时以最后一次替换为准，可能丢失对方新增的零点（缺失项下次查询时补算）。
+================================================================================
+"""
+
+import os
+import math
+import mpmath
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+ZERO_CACHE_DIR = os.environ.get(
+    "ZERO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "riemann_zeros")
+)
+
+
+def read_zero_table(filename: str) -> np.ndarray:
+    """批量读取 Odlyzko 格式零点表，返回 float64 数组（两列时取最后一列）"""
+    table = np.loadtxt(filename, dtype=np.float64, comments="#", ndmin=2)
+    return table[:, -1].copy()
+
+
+def _zetazero_imag(n: int, dps: int) -> float:
+    """进程池任务：以 dps 位精度计算 γ_n"""
+    mpmath.mp.dps = dps
+    return float(mpmath.zetazero(n).imag)
+
+
+class ZeroProvider:
+    """
+    黎曼零点 γ_n 的缓存式数据源
+
+    参数
+    ----------
+    cache_dir : str
+        缓存目录，默认 ZERO_CACHE_DIR（环境变量同名）
+    dps : int
+        补算时 mpmath 的十进制精度；结果存为 float64，25 位已足够
+    workers : int
+        补算的进程数，默认 CPU 核数
+    """
+
+    def __init__(self, cache_dir: str = None, dps: int = 25, workers: int = None):
+        self.path = os.path.join(cache_dir or ZERO_CACHE_DIR, "gamma_float64.npy")
+        self.dps = dps
+        self.workers = workers or os.cpu_count() or 1
+        self._gammas = self._open()
+
+    def _open(self) -> np.ndarray:
+        if os.path.exists(self.path):
+            return np.load(self.path, mmap_mode="r")
+        return np.zeros(0, dtype=np.float64)
+
+    @property
+    def cached(self) -> int:
+        """缓存中已知的零点个数"""
+        return int(np.count_nonzero(~np.isnan(self._gammas)))
+
+    def _store(self, start: int, values: np.ndarray) -> None:
+        """把 γ_start, γ_start+1, … 写入缓存（临时文件 + 原子替换）"""
+        old = self._open()
+        size = max(len(old), start - 1 + len(values))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        table = np.lib.format.open_memmap(
+            tmp, mode="w+", dtype=np.float64, shape=(size,)
+        )
+        table[: len(old)] = old
+        table[len(old) :] = np.nan
+        known = ~np.isnan(values)
+        table[start - 1 : start - 1 + len(values)][known] = values[known]
+        table.flush()
+        del table
+        os.replace(tmp, self.path)
+        self._gammas = self._open()
+
+    def load_text(self, filename: str, start: int = 1) -> int:
+        """导入 Odlyzko 格式文本表，表中第一行对应 γ_start，返回导入个数"""
+        values = read_zero_table(filename)
+        self._store(start, values)
+        return len(values)
+
+    def _compute(self, indices: np.ndarray) -> np.ndarray:
+        """在进程池中计算给定序号的 γ_n"""
+        indices = [int(n) for n in indices]
+        if self.workers == 1 or len(indices) == 1:
+            return np.array([_zetazero_imag(n, self.dps) for n in indices])
+        chunksize = max(1, math.ceil(len(indices) / (4 * self.workers)))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            gammas = executor.map(
+                _zetazero_imag, indices, [self.dps] * len(indices), chunksize=chunksize
+            )
+            return np.fromiter(gammas, dtype=np.float64, count=len(indices))
+
+    def range(self, start: int, stop: int) -> np.ndarray:
+        """γ_n（start ≤ n < stop，n从1起）；已缓存时直接返回只读mmap切片"""
+        if not 1 <= start <= stop:
+            raise ValueError(f"需要 1 ≤ start ≤ stop，得到 start={start}, stop={stop}")
+        part = self._gammas[start - 1 : stop - 1]
+        missing = np.flatnonzero(np.isnan(part)) + start
+        missing = np.concatenate((missing, np.arange(start + len(part), stop)))
+        if len(missing):
+            values = np.full(stop - start, np.nan)
+            values[missing - start] = self._compute(missing)
+            self._store(start, values)
+        return self._gammas[start - 1 : stop - 1]
+
+    def first(self, n: int) -> np.ndarray:
+        """前 n 个零点 γ_1, …, γ_n"""
+        return self.range(1, n + 1)
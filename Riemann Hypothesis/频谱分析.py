@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+频谱峰值引擎：向量化局部极大 + Δf 单遍抑制 + 二分匹配理论零点
+================================================================================
+
+NCDFT 验证与显式公式验证共用的峰值检测与零点匹配：
+
+1. 局部极大：spectrum[i] 严格大于左右相邻点，整批比较得到候选下标。
+2. Δf 抑制：候选按频率升序单遍扫描。已保留的峰两两间距 ≥ Δf，
+   故新候选只可能与最后一个保留峰冲突：
+   - replace=True：幅度更大则替换该峰（NCDFT 语义）；
+   - replace=False：先到者保留（显式公式验证语义）。
+3. 匹配：检测频率升序排列，理论频率经 np.searchsorted 找到最近峰，
+   距离 < Δf 记为匹配。整体代价 O(N + P + Z log P)。
+================================================================================
+"""
+
+import numpy as np
+from numba import njit
+
+
+def local_maxima(spectrum: np.ndarray) -> np.ndarray:
+    """严格局部极大值的下标（不含两端点）"""
+    s = np.asarray(spectrum)
+    return np.flatnonzero((s[1:-1] > s[:-2]) & (s[1:-1] > s[2:])) + 1
+
+
+@njit(cache=True)
+def _suppress_kernel(freqs, amps, delta_f, replace):
+    keep = np.empty(len(freqs), dtype=np.int64)
+    m = 0
+    for i in range(len(freqs)):
+        if m and abs(freqs[i] - freqs[keep[m - 1]]) < delta_f:
+            if replace and amps[i] > amps[keep[m - 1]]:
+                keep[m - 1] = i
+        else:
+            keep[m] = i
+            m += 1
+    return keep[:m]
+
+
+def suppress_peaks(
+    freqs: np.ndarray, amps: np.ndarray, delta_f: float, replace: bool = True
+) -> np.ndarray:
+    """Δf 内的峰只保留一个，返回保留峰在输入中的下标（freqs 需升序）"""
+    freqs = np.ascontiguousarray(freqs, dtype=np.float64)
+    amps = np.ascontiguousarray(amps, dtype=np.float64)
+    return _suppress_kernel(freqs, amps, float(delta_f), replace)
+
+
+def detect_peaks(
+    spectrum: np.ndarray, frequencies: np.ndarray, delta_f: float, replace: bool = True
+) -> np.ndarray:
+    """局部极大 + Δf 抑制，返回保留峰在频谱中的下标（频率升序）"""
+    idx = local_maxima(spectrum)
+    return idx[suppress_peaks(frequencies[idx], spectrum[idx], delta_f, replace)]
+
+
+def nearest_peaks(detected: np.ndarray, targets) -> tuple:
+    """
+    每个目标频率的最近检测峰：返回 (下标, 距离)，detected 需升序
+
+    等距时取频率较低者；detected 为空时下标为 -1、距离为 inf。
+    """
+    detected = np.asarray(detected, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    if not len(detected):
+        return np.full(len(targets), -1), np.full(len(targets), np.inf)
+    right = np.clip(np.searchsorted(detected, targets), 0, len(detected) - 1)
+    left = np.maximum(right - 1, 0)
+    d_left = np.abs(detected[left] - targets)
+    d_right = np.abs(detected[right] - targets)
+    take_right = d_right < d_left
+    return np.where(take_right, right, left), np.where(take_right, d_right, d_left)
+
+
+def count_matches(detected: np.ndarray, targets, delta_f: float) -> int:
+    """与最近检测峰距离 < Δf 的目标频率个数"""
+    _, dist = nearest_peaks(detected, targets)
+    return int(np.count_nonzero(dist < delta_f))
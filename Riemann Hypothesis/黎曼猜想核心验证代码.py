@@ -33,62 +33,23 @@ NCDFT 严格验证：平台期铁证与双重锁定（完整版）
 ================================================================================
 """
 
+import os
+import sys
 import numpy as np
 import math
-import mpmath
 from scipy import stats
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import numba
-from numba import njit, prange
-
-mpmath.mp.dps = 50
-
-
-@njit(cache=True)
-def _psi_numba(x, primes_np):
-    """Numba 加速的 Chebyshev ψ(x) 计算"""
-    total = 0.0
-    for p in primes_np:
-        if p > x:
-            break
-        pk = p
-        logp = math.log(p)
-        while pk <= x:
-            total += logp
-            pk *= p
-    return total
-
-
-@njit(parallel=True, cache=True)
-def _construct_signal_numba(
-    t_vals, alpha, x_min, x_max, primes_np, max_prime, li_vals, phase_scale
-):
-    """Numba 并行信号构造"""
-    N = len(t_vals)
-    signal = np.zeros(N, dtype=np.complex128)
-    phase_factor = (alpha - 0.5) * phase_scale
-
-    for i in prange(N):
-        t = t_vals[i]
-        x = int(np.exp(t))
-        if x > x_max:
-            x = x_max
-
-        if x > 100 and x <= max_prime * 1.1:
-            psi_x = _psi_numba(x, primes_np)
-            base = (psi_x - x) / math.sqrt(x)
-        else:
-            base = 0.0
+from scipy import fft as sp_fft
 
-        if abs(phase_factor) > 1e-6:
-            li_x = li_vals[i]
-            phase = phase_factor * li_x
-            signal[i] = base * np.exp(1j * phase)
-        else:
-            signal[i] = base
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "math")
+)
+from 快速素数筛选 import li, load_prime_table, psi_prefix_table, psi_samples
+from 零点数据 import ZeroProvider
+from 频谱分析 import count_matches, detect_peaks
 
-    return signal
+# scan_alpha 每批信号矩阵的内存上限（complex128，约 128MB）
+SCAN_BLOCK_BYTES = 1 << 27
 
 
 class NCDFTVerifier:
@@ -108,7 +69,7 @@ class NCDFTVerifier:
     phase_scale : float
         相位调制缩放因子，默认 0.1
     n_threads : int
-        并行线程数，默认 4
+        批量 FFT 的并行线程数，默认 4
     """
 
     def __init__(
@@ -126,12 +87,11 @@ class NCDFTVerifier:
         self.prime_limit = prime_limit
         self.phase_scale = phase_scale
         self.n_threads = n_threads
+        self._bases = {}
 
         print("[*] 预计算黎曼零点...")
         start = time.time()
-        self.gamma_vals = np.array(
-            [float(mpmath.zetazero(n).imag) for n in range(1, max_zero_idx + 1)]
-        )
+        self.gamma_vals = np.array(ZeroProvider().first(max_zero_idx))
         self.theory_freqs = self.gamma_vals / (2 * math.pi)
         print(f"[+] 完成，耗时 {time.time()-start:.1f}s")
 
@@ -140,57 +100,77 @@ class NCDFTVerifier:
         print(f"[+] T={self.T:.2f}, Heisenberg Δf={self.delta_f:.4f}")
 
         print("[*] 生成素数表...")
-        self.primes = self._generate_primes(min(self.x_max, prime_limit))
+        primes = self._generate_primes(min(self.x_max, prime_limit))
+        self.max_prime = int(primes[-1])
+        # ψ 前缀表覆盖到 1.1·max_prime（信号在此之外置零），只建一次
+        self._psi_powers, self._psi_prefix = psi_prefix_table(
+            primes, int(self.max_prime * 1.1)
+        )
+        self.primes = self.primes_np = primes
         print(f"[+] 素数表：{len(self.primes):,} 个素数 (上限 {prime_limit})")
-        self.primes_np = np.array(self.primes, dtype=np.int32)
-        self.max_prime = self.primes[-1]
 
     def _generate_primes(self, limit):
-        """埃拉托色尼筛法生成素数列表"""
-        sieve = bytearray(b"\x01") * (limit + 1)
-        sieve[0:2] = b"\x00\x00"
-        for i in range(2, int(math.sqrt(limit)) + 1):
-            if sieve[i]:
-                sieve[i * i : limit + 1 : i] = b"\x00" * ((limit - i * i) // i + 1)
-        return [i for i in range(2, limit + 1) if sieve[i]]
+        """读取磁盘缓存的 uint64 素数表（mmap只读，首次运行时增量构建）"""
+        return load_prime_table(limit, np.uint64)
 
     def _li(self, x):
-        """计算对数积分 Li(x) = ∫₂^x dt/ln(t)"""
-        if x <= 2:
-            return 0.0
-        try:
-            return float(mpmath.li(x))
-        except:
-            return x / math.log(x) if x > 1 else 0.0
+        """对数积分 li(x)（scipy expi 整批向量化），x ≤ 2 处取0"""
+        x = np.asarray(x, dtype=np.float64)
+        return np.where(x > 2, li(np.maximum(x, 2.0)), 0.0)
+
+    def _base_signal(self, num_samples):
+        """
+        α 无关部分：基础振荡 (ψ(x)-x)/√x、Li(x) 网格与步长 Δt，按 N_s 缓存
+
+        全部采样点的 ψ(x) 对预建的 Λ 前缀表一次 searchsorted 得到，
+        总代价 O(π(x_max) + N_s)（前缀表在 __init__ 中只建一次）。
+        """
+        if num_samples not in self._bases:
+            t_vals = np.linspace(
+                math.log(self.x_min), math.log(self.x_max), num_samples
+            )
+            delta_t = t_vals[1] - t_vals[0]
+
+            x_vals = np.minimum(np.exp(t_vals).astype(np.int64), self.x_max)
+            li_vals = self._li(x_vals)
+
+            psi_x = psi_samples(x_vals, self._psi_powers, self._psi_prefix)
+            valid = (x_vals > 100) & (x_vals <= self.max_prime * 1.1)
+            base = np.where(valid, (psi_x - x_vals) / np.sqrt(x_vals), 0.0)
+            self._bases[num_samples] = (base, li_vals, delta_t)
+        return self._bases[num_samples]
+
+    def _phase_factors(self, alphas, phase_scales):
+        """(α-1/2)·scale 网格，|·| ≤ 1e-6 处置零（不施加相位）"""
+        pf = (np.asarray(alphas, dtype=np.float64)[:, None] - 0.5) * np.asarray(
+            phase_scales, dtype=np.float64
+        )[None, :]
+        return np.where(np.abs(pf) > 1e-6, pf, 0.0)
 
     def construct_signal(self, alpha, num_samples):
         """
-        构造 NCDFT 信号
+        构造 NCDFT 信号：基础振荡乘以相位因子 exp[i·(α-1/2)·scale·Li(x)]，再去均值
         """
-        t_vals = np.linspace(math.log(self.x_min), math.log(self.x_max), num_samples)
-        delta_t = t_vals[1] - t_vals[0]
-
-        x_vals = np.exp(t_vals).astype(int)
-        li_vals = np.array([self._li(x) for x in x_vals])
-
-        signal = _construct_signal_numba(
-            t_vals,
-            alpha,
-            self.x_min,
-            self.x_max,
-            self.primes_np,
-            self.max_prime,
-            li_vals,
-            self.phase_scale,
-        )
+        base, li_vals, delta_t = self._base_signal(num_samples)
+
+        phase_factor = (alpha - 0.5) * self.phase_scale
+        if abs(phase_factor) > 1e-6:
+            signal = base * np.exp(1j * phase_factor * li_vals)
+        else:
+            signal = base.astype(np.complex128)
 
         signal = signal - np.mean(signal)
 
         return signal, delta_t
 
+    def _spectrum_matches(self, spectrum, frequencies, target_n):
+        """单条正频率幅度谱的峰值检测与零点匹配（Δf 内冲突时保留幅度更大者）"""
+        detected_freqs = frequencies[detect_peaks(spectrum, frequencies, self.delta_f)]
+        return count_matches(detected_freqs, self.theory_freqs[:target_n], self.delta_f)
+
     def detect_peaks(self, signal, delta_t, target_n):
         """
-        检测峰值并匹配理论零点
+        检测峰值并匹配理论零点（向量化局部极大 + Δf 单遍抑制 + 二分匹配）
         """
         N = len(signal)
         window = np.kaiser(N, beta=14)
@@ -201,32 +181,49 @@ class NCDFTVerifier:
         frequencies = freqs[pos_mask]
         spectrum = np.abs(fft_result[pos_mask])
 
-        peaks = []
-        for i in range(1, len(spectrum) - 1):
-            if spectrum[i] > spectrum[i - 1] and spectrum[i] > spectrum[i + 1]:
-                freq = frequencies[i]
-                conflict = False
-                for j, (f_exist, amp_exist) in enumerate(peaks):
-                    if abs(f_exist - freq) < self.delta_f:
-                        if spectrum[i] > amp_exist:
-                            peaks[j] = (freq, spectrum[i])
-                        conflict = True
-                        break
-                if not conflict:
-                    peaks.append((freq, spectrum[i]))
-
-        detected_freqs = np.array([p[0] for p in peaks])
-
-        matches = 0
-        for f_theory in self.theory_freqs[:target_n]:
-            if len(detected_freqs) == 0:
-                break
-            dists = np.abs(detected_freqs - f_theory)
-            min_dist = np.min(dists)
-            if min_dist < self.delta_f:
-                matches += 1
-
-        return matches, []
+        return self._spectrum_matches(spectrum, frequencies, target_n), []
+
+    def scan_alpha(self, alphas, phase_scales=None, Ns=65536, target_n=100):
+        """
+        α × phase_scale × N_s 网格扫描，返回匹配数数组，形状 (len(Ns), len(alphas), len(phase_scales))
+
+        每个 N_s 的基础振荡与 Li(x) 只算一次；相位因子按 (α, scale) 广播成二维矩阵，
+        逐批（每批不超过 SCAN_BLOCK_BYTES）去均值、加 Kaiser 窗后沿最后一轴批量 FFT，
+        再逐行检测峰值。参数可为标量或序列；phase_scales 默认取 self.phase_scale。
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype=np.float64))
+        if phase_scales is None:
+            phase_scales = self.phase_scale
+        phase_scales = np.atleast_1d(np.asarray(phase_scales, dtype=np.float64))
+        Ns_list = np.atleast_1d(Ns).astype(np.int64)
+
+        pf = self._phase_factors(alphas, phase_scales).ravel()
+        matches = np.empty((len(Ns_list), len(pf)), dtype=np.int64)
+
+        for k, num_samples in enumerate(Ns_list):
+            num_samples = int(num_samples)
+            base, li_vals, delta_t = self._base_signal(num_samples)
+            window = np.kaiser(num_samples, beta=14)
+            freqs = np.fft.fftfreq(num_samples, d=delta_t)
+            pos_mask = freqs > 0
+            frequencies = freqs[pos_mask]
+
+            rows = max(1, SCAN_BLOCK_BYTES // (16 * num_samples))
+            for lo in range(0, len(pf), rows):
+                signals = base * np.exp(1j * pf[lo : lo + rows, None] * li_vals)
+                signals -= signals.mean(axis=1, keepdims=True)
+                signals *= window
+                spectra = np.abs(
+                    sp_fft.fft(
+                        signals, axis=-1, overwrite_x=True, workers=self.n_threads
+                    )[:, pos_mask]
+                )
+                for i, spectrum in enumerate(spectra):
+                    matches[k, lo + i] = self._spectrum_matches(
+                        spectrum, frequencies, target_n
+                    )
+
+        return matches.reshape(len(Ns_list), len(alphas), len(phase_scales))
 
     def statistical_test(self, matches, total):
         """
@@ -258,9 +255,8 @@ class NCDFTVerifier:
         Ns_list = [8192, 16384, 32768, 65536, 131072]
         results = []
 
-        for Ns in Ns_list:
-            signal, dt = self.construct_signal(alpha=0.5, num_samples=Ns)
-            matches, _ = self.detect_peaks(signal, dt, target_n)
+        scan = self.scan_alpha(0.5, Ns=Ns_list, target_n=target_n)
+        for Ns, matches in zip(Ns_list, scan[:, 0, 0].tolist()):
             rate = matches / target_n * 100
             results.append({"Ns": Ns, "matches": matches, "rate": rate})
             print(f"  N_s={Ns:6d}: {matches:3d}/{target_n} ({rate:5.1f}%)")
@@ -284,36 +280,29 @@ class NCDFTVerifier:
 
     def double_locking_test(self, target_n=100):
         """
-        双重锁定验证（多线程）
+        双重锁定验证（scan_alpha 一次扫描全部 α，基础信号只构造一次）
         """
         print("\n" + "=" * 70)
-        print("双重锁定验证（多线程）")
+        print("双重锁定验证（α 批量扫描）")
         print("=" * 70)
 
         alphas = [0.3, 0.5, 0.7, 0.9]
         Ns = 65536
 
-        def test_one(alpha):
-            signal, dt = self.construct_signal(alpha, Ns)
-            matches, _ = self.detect_peaks(signal, dt, target_n)
-            return {"alpha": alpha, **self.statistical_test(matches, target_n)}
-
+        scan = self.scan_alpha(alphas, Ns=Ns, target_n=target_n)
         results = []
-        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
-            futures = {executor.submit(test_one, a): a for a in alphas}
-            for future in as_completed(futures):
-                res = future.result()
-                results.append(res)
-                alpha = res["alpha"]
-                marker = (
-                    "✓ CRITICAL"
-                    if (res["significant"] and abs(alpha - 0.5) < 0.01)
-                    else "✗"
-                )
-                print(
-                    f"  α={alpha:.2f}: {res['matches']:3d}/{target_n} ({res['rate']:5.1f}%) "
-                    f"p={res['p_value']:.2e} [{marker}]"
-                )
+        for alpha, matches in zip(alphas, scan[0, :, 0].tolist()):
+            res = {"alpha": alpha, **self.statistical_test(matches, target_n)}
+            results.append(res)
+            marker = (
+                "✓ CRITICAL"
+                if (res["significant"] and abs(alpha - 0.5) < 0.01)
+                else "✗"
+            )
+            print(
+                f"  α={alpha:.2f}: {res['matches']:3d}/{target_n} ({res['rate']:5.1f}%) "
+                f"p={res['p_value']:.2e} [{marker}]"
+            )
 
         return results
 
@@ -22,18 +22,46 @@ Comparative Analysis of Five Prime Generation Algorithms (with memory & validati
 ================================================================================
 """
 
+import os
+import json
 import time
 import math
-import array
+import signal
+import platform
+import argparse
+import threading
 import tracemalloc
+import multiprocessing
+import mpmath
+import numpy as np
+from numba import njit, prange
+from scipy.special import expi
+from queue import Empty
 from typing import List, Tuple
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ==================== 输出类型：紧凑定长数组 ====================
+def _prime_dtype(n: int):
+    """能容纳[0, n]的最小无符号类型：n < 2^32 用uint32（4字节/素数），否则uint64"""
+    return np.uint32 if n < 1 << 32 else np.uint64
+
+
+def _fill_chunks(out: np.ndarray, filled: int, chunks) -> int:
+    """把按序产出的素数块依次写入预分配数组，返回写入后的位置"""
+    for chunk in chunks:
+        out[filled : filled + len(chunk)] = chunk
+        filled += len(chunk)
+    return filled
 
 
 # ==================== 算法1：试除法 ====================
-def trial_division(n: int) -> List[int]:
+def trial_division(n: int, dtype=None) -> np.ndarray:
     """试除法 - O(n√n)时间，O(π(n))空间"""
+    dtype = dtype or _prime_dtype(n)
     if n < 2:
-        return []
+        return np.zeros(0, dtype=dtype)
     primes = []
     for x in range(2, n + 1):
         is_prime = True
@@ -46,68 +74,213 @@ def trial_division(n: int) -> List[int]:
                 break
         if is_prime:
             primes.append(x)
-    return primes
+    return np.array(primes, dtype=dtype)
 
 
 # ==================== 算法2：标准筛 ====================
-def standard_sieve(n: int) -> List[int]:
+def standard_sieve(n: int, dtype=None) -> np.ndarray:
     """Eratosthenes筛 - O(n log log n)时间，O(n)空间"""
+    dtype = dtype or _prime_dtype(n)
     if n < 2:
-        return []
+        return np.zeros(0, dtype=dtype)
     is_prime = [True] * (n + 1)
     is_prime[0] = is_prime[1] = False
     for i in range(2, int(math.sqrt(n)) + 1):
         if is_prime[i]:
             for j in range(i * i, n + 1, i):
                 is_prime[j] = False
-    return [i for i in range(n + 1) if is_prime[i]]
+    return np.flatnonzero(np.frombuffer(bytes(is_prime), dtype=np.bool_)).astype(dtype)
 
 
 # ==================== 算法3：分段筛 ====================
-def segmented_sieve(n: int) -> List[int]:
-    """分段筛 - O(n log log n)时间，O(√n)空间"""
-    if n < 2:
-        return []
-    sqrt_n = int(math.sqrt(n)) + 1
+SEGMENT_BYTES = 32768  # 32 KiB，与L1数据缓存匹配
 
-    base_primes = []
-    is_comp = [False] * (sqrt_n + 1)
-    for i in range(2, sqrt_n):
-        if not is_comp[i]:
-            base_primes.append(i)
-            for j in range(i * i, sqrt_n, i):
-                is_comp[j] = True
 
-    if n <= sqrt_n:
-        return [p for p in base_primes if p <= n]
+def _simple_sieve(limit: int) -> np.ndarray:
+    """基础素数表：bytearray切片筛出[2, limit]内的素数（用于√n以内的基素数）"""
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    sieve = bytearray(b"\x01") * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i : limit + 1 : i] = b"\x00" * ((limit - i * i) // i + 1)
+    return np.flatnonzero(np.frombuffer(sieve, dtype=np.uint8))
 
-    primes = [p for p in base_primes if p <= n]
-    seg_size = 32768
 
-    for low in range(sqrt_n, n + 1, seg_size):
-        high = min(low + seg_size - 1, n)
-        sieve = array.array("b", [1]) * (high - low + 1)
-        for p in base_primes:
-            if p * p > high:
-                break
-            start = ((low + p - 1) // p) * p
-            for j in range(start, high + 1, p):
-                if j >= low:
-                    sieve[j - low] = 0
-        for i in range(high - low + 1):
-            if sieve[i]:
-                primes.append(low + i)
+def _odd_multiple_offsets(primes: np.ndarray, lo: int) -> np.ndarray:
+    """
+    各奇素数 p 首个 ≥ max(lo, p²) 的奇倍数相对 lo 的偏移（uint64）
+
+    lo 须为奇数，故偏移恒为偶数；全程以uint64计算，lo < 2^64 均安全。
+    """
+    q = primes.astype(np.uint64)
+    lo_u = np.uint64(lo)
+    off = (q - lo_u % q) % q
+    off += (off & np.uint64(1)) * q
+    sq = q * q
+    late = sq > lo_u
+    off[late] = sq[late] - lo_u
+    return off
+
+
+def _sieve_segment(
+    low: int, high: int, base_primes: np.ndarray, hits: np.ndarray = None
+) -> np.ndarray:
+    """
+    筛出[low, high]内的素数（仅存奇数，第i字节对应 lo + 2i）
+
+    步长小于段长的基素数用切片赋值整批划掉倍数；更大的基素数在段内
+    至多命中一次，统一用花式索引一次写入。幸存者由np.flatnonzero收集。
+    起点偏移全程以uint64计算，high < 2^64 均安全；high ≥ 2^63 时返回uint64。
+    要求base_primes覆盖[2, √high]；桶筛模式下base_primes只含小素数，
+    大素数的命中位置（奇数下标）由 hits 给出。
+    """
+    dtype = np.int64 if high < 1 << 63 else np.uint64
+    empty = np.zeros(0, dtype=dtype)
+    if high < max(low, 2):
+        return empty
+    lo = max(low, 3) | 1
+    head = np.array([2], dtype=dtype) if low <= 2 <= high else None
+    if high < lo:
+        return empty if head is None else head
+
+    length = (high - lo) // 2 + 1
+    seg = np.ones(length, dtype=np.bool_)
+
+    n_odd = np.searchsorted(base_primes, math.isqrt(high), "right")
+    # 基素数分块处理，窗口远离原点时（√high以内上亿个基素数）临时数组有界
+    for blk in range(1, n_odd, SEGMENT_BYTES * 32):
+        odd = base_primes[blk : min(blk + SEGMENT_BYTES * 32, n_odd)]
+        idx = _odd_multiple_offsets(odd, lo) // np.uint64(2)
+
+        small = odd < length
+        for p, i in zip(odd[small].tolist(), idx[small].tolist()):
+            seg[i::p] = False
+        once = idx[~small]
+        seg[once[once < length].astype(np.intp)] = False
+    if hits is not None:
+        seg[hits] = False
+
+    primes = dtype(lo) + 2 * np.flatnonzero(seg).astype(dtype)
+    return primes if head is None else np.concatenate((head, primes))
+
+
+BUCKET_MIN_N = 10**11  # bucket='auto' 时 n ≥ 此下限才启用桶筛
+
+
+def _bucket_hits(low: int, high: int, large_primes: np.ndarray, span: int):
+    """
+    桶筛调度（Oliveira e Silva式）：逐段产出大基素数在该段的命中位置
+
+    每个大素数只登记在它下一次命中的段号桶里；处理某段时只取出该桶，
+    命中后前移 2p 再归入新桶。每段工作量正比于实际命中数而非 π(√n)。
+    产出的是相对 low 的偏移（均为奇数倍），第k段覆盖 [k·span, (k+1)·span)。
+    """
+    lo = max(low, 3) | 1
+    q = large_primes[: np.searchsorted(large_primes, math.isqrt(high), "right")]
+    buckets = {}
+    if len(q) and high >= lo:
+        # 首个 ≥ max(lo, p²) 的奇倍数，换算成相对low的偏移
+        nxt = _odd_multiple_offsets(q, lo).astype(np.int64) + (lo - low)
+        step = 2 * q.astype(np.int64)
+        _file_buckets(buckets, np.flatnonzero(nxt <= high - low), nxt, span)
+
+    for k in range((high - low) // span + 1):
+        ids = buckets.pop(k, None)
+        if ids is None:
+            yield np.zeros(0, dtype=np.int64)
+            continue
+        ids = np.concatenate(ids)
+        yield nxt[ids].copy()
+        nxt[ids] += step[ids]
+        _file_buckets(buckets, ids[nxt[ids] <= high - low], nxt, span)
+
+
+def _file_buckets(buckets: dict, ids: np.ndarray, nxt: np.ndarray, span: int) -> None:
+    """按下次命中的段号把素数下标归桶"""
+    if not len(ids):
+        return
+    segs = nxt[ids] // span
+    order = np.argsort(segs, kind="stable")
+    ids, segs = ids[order], segs[order]
+    cuts = np.flatnonzero(np.diff(segs)) + 1
+    for part, seg in zip(
+        np.split(ids, cuts), segs[np.concatenate(([0], cuts))].tolist()
+    ):
+        buckets.setdefault(seg, []).append(part)
+
+
+def _use_bucket(bucket, high: int) -> bool:
+    return high >= BUCKET_MIN_N if bucket == "auto" else bool(bucket)
+
+
+def _iter_segments(
+    low: int,
+    high: int,
+    base_primes: np.ndarray,
+    segment_bytes: int = SEGMENT_BYTES,
+    bucket=False,
+):
+    """按段（每段 segment_bytes 个奇数）依次产出[low, high]内的素数数组"""
+    span = 2 * segment_bytes
+    if not _use_bucket(bucket, high):
+        for seg_low in range(low, high + 1, span):
+            yield _sieve_segment(seg_low, min(seg_low + span - 1, high), base_primes)
+        return
+
+    # 步长 ≥ 段长的奇素数每段至多命中一次，交给桶筛（2始终留在小素数中）
+    split = np.searchsorted(base_primes, max(segment_bytes, 3))
+    small, hits = base_primes[:split], _bucket_hits(
+        low, high, base_primes[split:], span
+    )
+    for seg_low in range(low, high + 1, span):
+        offsets = next(hits) - ((max(seg_low, 3) | 1) - low)
+        yield _sieve_segment(
+            seg_low, min(seg_low + span - 1, high), small, offsets // 2
+        )
+
+
+def segmented_sieve(
+    n: int,
+    segment_size=SEGMENT_BYTES,
+    bucket="auto",
+    dtype=None,
+    backend: str = "python",
+) -> np.ndarray:
+    """
+    分段筛 - O(n log log n)时间，O(√n)空间（numpy切片赋值，默认32 KiB段）
+
+    segment_size 为段长（字节，每字节一个奇数）；'auto' 使用本机自动调优结果。
+    bucket 为桶筛开关，'auto' 时 n ≥ BUCKET_MIN_N 启用。
+    各段结果直接写入按 prime_count(n) 预分配的 dtype 数组。
+    backend='numba' 时各段由编译内核在 prange 中并行筛（不使用桶筛）。
+    """
+    dtype = dtype or _prime_dtype(n)
+    if n < 2:
+        return np.zeros(0, dtype=dtype)
+    segment_bytes = _resolve_segment_size("segmented", segment_size)
+    base_primes = _simple_sieve(math.isqrt(n))
+    if backend == "numba":
+        return _segmented_numba(n, base_primes, segment_bytes, dtype)
+    primes = np.empty(prime_count(n), dtype=dtype)
+    _fill_chunks(primes, 0, _iter_segments(2, n, base_primes, segment_bytes, bucket))
     return primes
 
 
 # ==================== 算法4：标准Wheel ====================
-def standard_wheel_sieve(n: int) -> List[int]:
-    """30-wheel筛 - O(n log log n)时间，O(n)空间，标记减少73%"""
+WHEEL30 = np.array([1, 7, 11, 13, 17, 19, 23, 29], dtype=np.int64)  # 与30互素的余数
+def standard_wheel_sieve(n: int, dtype=None, backend: str = "python") -> np.ndarray:
+    """30-wheel筛 - O(n log log n)时间，O(n)空间，标记减少73%（backend='numba' 为编译版）"""
+    dtype = dtype or _prime_dtype(n)
     if n < 2:
-        return []
+        return np.zeros(0, dtype=dtype)
     small = [2, 3, 5]
     if n <= 5:
-        return [p for p in small if p <= n]
+        return np.array([p for p in small if p <= n], dtype=dtype)
+    if backend == "numba":
+        survivors = np.flatnonzero(_nb_wheel30_kernel(n))
+        return np.concatenate((small, survivors)).astype(dtype)
 
     sqrt_n = int(math.sqrt(n)) + 1
     base = []
@@ -118,8 +291,7 @@ def standard_wheel_sieve(n: int) -> List[int]:
             for j in range(i * i, sqrt_n, i):
                 is_comp[j] = True
 
-    primes = small[:]
-    wheel = [1, 7, 11, 13, 17, 19, 23, 29]
+    wheel = WHEEL30.tolist()
     is_prime = [False] * (n + 1)
 
     for k in range(n // 30 + 1):
@@ -135,88 +307,1484 @@ def standard_wheel_sieve(n: int) -> List[int]:
             if is_prime[j]:
                 is_prime[j] = False
 
-    for x in range(6, n + 1):
-        if is_prime[x]:
-            primes.append(x)
-    return primes
+    survivors = np.flatnonzero(np.frombuffer(bytes(is_prime), dtype=np.bool_))
+    return np.concatenate((small, survivors)).astype(dtype)
 
 
 # ==================== 算法5：自适应wheel算法 ====================
-def adaptive_wheel_sieve(n: int) -> List[int]:
-    """30030-wheel分段筛 - O(n log log n)时间，O(√n + seg)空间"""
+WHEEL_MODULUS = 30030
+WHEEL_SMALL_PRIMES = [2, 3, 5, 7, 11, 13]
+WHEEL_CHUNK = WHEEL_MODULUS * 156
+
+# 预筛模板：周期 30030·17，2..17 的倍数已划掉；仍是30030的整数倍周期
+PRESIEVE_PRIMES = WHEEL_SMALL_PRIMES + [17]
+PRESIEVE_MAX = PRESIEVE_PRIMES[-1]  # 模板已划掉其倍数的最大素数
+PRESIEVE_PERIOD = WHEEL_MODULUS * 17
+_PRESIEVE_PATTERN = np.ones(PRESIEVE_PERIOD, dtype=np.bool_)
+for _p in PRESIEVE_PRIMES:
+    _PRESIEVE_PATTERN[::_p] = False
+_presieve_tiled = _PRESIEVE_PATTERN
+
+
+def _presieve_tiles(length: int) -> np.ndarray:
+    """模板平铺到至少 PRESIEVE_PERIOD + length，任意起点都可一次切片拷出整段"""
+    global _presieve_tiled
+    if len(_presieve_tiled) < PRESIEVE_PERIOD + length:
+        reps = -(-(PRESIEVE_PERIOD + length) // PRESIEVE_PERIOD)
+        _presieve_tiled = np.tile(_PRESIEVE_PATTERN, reps)
+    return _presieve_tiled
+
+
+def _wheel_segment(
+    low: int, high: int, base_primes: np.ndarray, hits: np.ndarray = None
+) -> np.ndarray:
+    """30030-wheel单段：拷入预筛模板，再划掉大于17的基素数倍数，向量化收集
+
+    桶筛模式下 base_primes 只含小素数，大素数命中位置（段内下标）由 hits 给出。
+    """
+    length = high - low + 1
+    offset = low % PRESIEVE_PERIOD
+    sieve = _presieve_tiles(length)[offset : offset + length].copy()
+
+    for p in base_primes.tolist():
+        if p * p > high:
+            break
+        if p <= PRESIEVE_MAX:
+            continue
+        start_mark = max(((low + p - 1) // p) * p, p * p)
+        sieve[start_mark - low :: p] = False
+    if hits is not None:
+        sieve[hits] = False
+
+    return low + np.flatnonzero(sieve)
+
+
+def iter_primes(start: int, stop: int, chunk=WHEEL_CHUNK, bucket="auto"):
+    """
+    流式素数生成器：按段升序产出[start, stop)内的素数数组
+
+    首个30030块直接由基础筛给出，之后每段 chunk 个整数走30030-wheel分段筛
+    （chunk='auto' 使用本机自动调优结果；bucket 同 segmented_sieve）。
+    常驻内存仅为√stop以内的基素数加一个段，O(√n + seg)。
+    """
+    if stop <= 2 or start >= stop:
+        return
+    chunk = _resolve_segment_size("adaptive_wheel", chunk)
+    base_primes = _simple_sieve(math.isqrt(stop - 1))
+
+    if start <= WHEEL_MODULUS:
+        head = _simple_sieve(min(stop - 1, WHEEL_MODULUS))
+        head = head[head >= start]
+        if len(head):
+            yield head
+
+    first = max(start, WHEEL_MODULUS + 1)
+    if not _use_bucket(bucket, stop - 1):
+        for low in range(first, stop, chunk):
+            primes = _wheel_segment(low, min(low + chunk, stop) - 1, base_primes)
+            if len(primes):
+                yield primes
+        return
+
+    split = np.searchsorted(base_primes, max(chunk, 3))
+    small, hits = base_primes[:split], _bucket_hits(
+        first, stop - 1, base_primes[split:], chunk
+    )
+    for low in range(first, stop, chunk):
+        primes = _wheel_segment(
+            low, min(low + chunk, stop) - 1, small, next(hits) - (low - first)
+        )
+        if len(primes):
+            yield primes
+
+
+def adaptive_wheel_sieve(
+    n: int, segment_size=WHEEL_CHUNK, bucket="auto", dtype=None, backend: str = "python"
+) -> np.ndarray:
+    """30030-wheel分段筛 - O(n log log n)时间，O(√n + seg)空间（segment_size可取'auto'）"""
+    dtype = dtype or _prime_dtype(n)
     if n < 2:
-        return []
-    small_primes = [2, 3, 5, 7, 11, 13]
-    if n <= 13:
-        return [p for p in small_primes if p <= n]
+        return np.zeros(0, dtype=dtype)
+    if backend == "numba":
+        chunk = _resolve_segment_size("adaptive_wheel", segment_size)
+        return _adaptive_wheel_numba(n, chunk, dtype)
+    primes = np.empty(prime_count(n), dtype=dtype)
+    _fill_chunks(primes, 0, iter_primes(2, n + 1, segment_size, bucket))
+    return primes
 
-    sqrt_n = int(math.sqrt(n)) + 1
-    max_small = max(small_primes)
 
-    base_primes = []
-    is_comp = [False] * (sqrt_n + 1)
-    for i in range(2, sqrt_n):
-        if not is_comp[i]:
-            base_primes.append(i)
-            for j in range(i * i, sqrt_n, i):
-                is_comp[j] = True
+# ==================== Numba编译后端 ====================
 
-    primes = [p for p in small_primes if p <= n]
-    primes.extend([p for p in base_primes if p > max_small and p <= n])
 
-    modulus = 30030
+@njit(cache=True)
+def _nb_wheel30_kernel(n):
+    """30-wheel筛编译内核：返回 is_prime 布尔数组（2、3、5不置位）"""
+    is_prime = np.zeros(n + 1, dtype=np.bool_)
+    for k in range(n // 30 + 1):
+        for r in WHEEL30:
+            x = 30 * k + r
+            if 5 < x <= n:
+                is_prime[x] = True
+    p = 7
+    while p * p <= n:
+        if is_prime[p]:
+            for j in range(p * p, n + 1, p):
+                is_prime[j] = False
+        p += 1
+    return is_prime
 
-    # 处理sqrt_n到modulus间隙
-    gap_start = sqrt_n
-    gap_end = min(n, modulus)
-    if gap_start <= gap_end:
-        for x in range(gap_start, gap_end + 1):
-            is_prime = True
-            for p in base_primes:
-                if p * p > x:
-                    break
-                if x % p == 0:
-                    is_prime = False
+
+@njit(cache=True)
+def _nb_odd_segment(lo, length, odd_primes, seg):
+    """奇数段编译内核：seg[i] 对应 lo + 2i（lo为奇数）"""
+    seg[:length] = True
+    high = lo + 2 * (length - 1)
+    for p in odd_primes:
+        if p * p > high:
+            break
+        start = max(p * p, (lo + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        for j in range((start - lo) // 2, length, p):
+            seg[j] = False
+
+
+@njit(cache=True)
+def _nb_wheel_segment(low, length, pattern, primes, seg):
+    """30030-wheel段编译内核：平铺预筛模板后划掉大于17的基素数倍数"""
+    period = len(pattern)
+    k = low % period
+    i = 0
+    while i < length:
+        m = min(length - i, period - k)
+        seg[i : i + m] = pattern[k : k + m]
+        i += m
+        k = 0
+    high = low + length - 1
+    for p in primes:
+        if p * p > high:
+            break
+        if p <= PRESIEVE_MAX:
+            continue
+        start = max(p * p, (low + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        for j in range(start - low, length, 2 * p):
+            seg[j] = False
+
+
+@njit(parallel=True, cache=True)
+def _nb_segment_counts(lo, n_items, seg_len, step, primes, pattern, wheel):
+    """prange第一遍：各段独立筛，只记录幸存者个数"""
+    n_seg = (n_items + seg_len - 1) // seg_len
+    counts = np.zeros(n_seg, dtype=np.int64)
+    for s in prange(n_seg):
+        seg = np.empty(seg_len, dtype=np.bool_)
+        length = min(seg_len, n_items - s * seg_len)
+        start = lo + step * s * seg_len
+        if wheel:
+            _nb_wheel_segment(start, length, pattern, primes, seg)
+        else:
+            _nb_odd_segment(start, length, primes, seg)
+        counts[s] = np.count_nonzero(seg[:length])
+    return counts
+
+
+@njit(parallel=True, cache=True)
+def _nb_segment_fill(lo, n_items, seg_len, step, primes, pattern, wheel, offsets, out):
+    """prange第二遍：按前缀和偏移把各段素数写入输出数组"""
+    n_seg = len(offsets)
+    for s in prange(n_seg):
+        seg = np.empty(seg_len, dtype=np.bool_)
+        length = min(seg_len, n_items - s * seg_len)
+        start = lo + step * s * seg_len
+        if wheel:
+            _nb_wheel_segment(start, length, pattern, primes, seg)
+        else:
+            _nb_odd_segment(start, length, primes, seg)
+        pos = offsets[s]
+        for i in range(length):
+            if seg[i]:
+                out[pos] = start + step * i
+                pos += 1
+
+
+def _run_numba_segments(
+    head: np.ndarray,
+    lo: int,
+    n_items: int,
+    seg_len: int,
+    step: int,
+    primes,
+    wheel: bool,
+    dtype,
+):
+    """两遍prange：先数后填，输出直接写入预分配的 dtype 数组，内存 O(√n + 段数)"""
+    primes = primes.astype(np.int64)
+    pattern = _PRESIEVE_PATTERN if wheel else np.zeros(1, dtype=np.bool_)
+    if n_items <= 0:
+        return head.astype(dtype)
+    counts = _nb_segment_counts(lo, n_items, seg_len, step, primes, pattern, wheel)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1])) + len(head)
+    out = np.empty(len(head) + int(counts.sum()), dtype=dtype)
+    out[: len(head)] = head
+    _nb_segment_fill(lo, n_items, seg_len, step, primes, pattern, wheel, offsets, out)
+    return out
+
+
+def _segmented_numba(
+    n: int, base_primes: np.ndarray, segment_bytes: int, dtype
+) -> np.ndarray:
+    """分段筛numba后端：奇数段，段长 segment_bytes"""
+    head = np.array([2], dtype=np.int64)
+    return _run_numba_segments(
+        head, 3, (n - 3) // 2 + 1, segment_bytes, 2, base_primes[1:], False, dtype
+    )
+
+
+def _adaptive_wheel_numba(n: int, chunk: int, dtype) -> np.ndarray:
+    """自适应wheel numba后端：首个30030块由基础筛给出，其余按 chunk 分段"""
+    head = _simple_sieve(min(n, WHEEL_MODULUS))
+    base_primes = _simple_sieve(math.isqrt(n))
+    lo = WHEEL_MODULUS + 1
+    return _run_numba_segments(head, lo, n - lo + 1, chunk, 1, base_primes, True, dtype)
+
+
+# ==================== 区间筛：大偏移窗口 ====================
+RANGE_SEGMENT_BYTES = 1 << 24
+
+
+def _base_primes(limit: int) -> np.ndarray:
+    """[2, limit]内的基素数；limit较大时分段生成并以uint32存放（limit < 2^32）"""
+    if limit <= RANGE_SEGMENT_BYTES:
+        return _simple_sieve(limit)
+    inner = _simple_sieve(math.isqrt(limit))
+    primes = np.empty(prime_count(limit), dtype=np.uint32)
+    _fill_chunks(primes, 0, _iter_segments(2, limit, inner, RANGE_SEGMENT_BYTES))
+    return primes
+
+
+def primes_in_range(
+    a: int, b: int, segment_bytes: int = RANGE_SEGMENT_BYTES
+) -> np.ndarray:
+    """
+    区间筛：只筛窗口[a, b]，无需从2开始，支持 0 ≤ a ≤ b < 2^64
+
+    基素数取到√b，起点偏移以uint64计算。窗口远离原点时每段的主要开销
+    是遍历全部基素数求偏移，因此默认段长取16M个奇数以摊薄该成本。
+    """
+    if not 0 <= a <= b < 1 << 64:
+        raise ValueError(f"需要 0 ≤ a ≤ b < 2^64，得到 a={a}, b={b}")
+    # 各段按自身上端取int64/uint64，跨2^63时须统一转为按b确定的dtype，否则拼接会提升为float64
+    dtype = np.int64 if b < 1 << 63 else np.uint64
+    base_primes = _base_primes(math.isqrt(b))
+    chunks = [
+        c.astype(dtype, copy=False)
+        for c in _iter_segments(a, b, base_primes, segment_bytes)
+    ]
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+
+# ==================== 磁盘素数表缓存（mmap共享） ====================
+PRIME_CACHE_DIR = os.environ.get(
+    "PRIME_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "prime_tables")
+)
+
+
+def _cache_entries(dtype, cache_dir: str) -> List[Tuple[int, str]]:
+    """列出缓存目录中该dtype的素数表 [(limit, path)]，按limit升序"""
+    prefix = f"primes_{np.dtype(dtype).name}_"
+    entries = []
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith(".npy"):
+                entries.append(
+                    (int(name[len(prefix) : -4]), os.path.join(cache_dir, name))
+                )
+    return sorted(entries)
+
+
+def load_prime_table(limit: int, dtype=np.uint32, cache_dir: str = None) -> np.ndarray:
+    """
+    读取[2, limit]内素数的只读数组，磁盘缓存以 np.load(mmap_mode='r') 打开
+
+    缓存文件按 dtype 和 limit 命名（primes_<dtype>_<limit>.npy）。
+    - 已有 limit' ≥ limit 的表：直接mmap并切片，零拷贝；
+    - 否则从 ≤ limit 的最大表增量续筛 (limit', limit]，写入新表。
+    新表先写临时文件再原子替换，多进程并发构建互不破坏，
+    读者共享同一份页缓存。
+    """
+    cache_dir = cache_dir or PRIME_CACHE_DIR
+    if limit >= np.iinfo(dtype).max:
+        raise ValueError(f"{np.dtype(dtype).name} 无法容纳 limit={limit}")
+    entries = _cache_entries(dtype, cache_dir)
+
+    for cached_limit, path in entries:
+        if cached_limit >= limit:
+            table = np.load(path, mmap_mode="r")
+            return table[: np.searchsorted(table, limit, "right")]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"primes_{np.dtype(dtype).name}_{limit}.npy")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    table = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=dtype, shape=(prime_count(limit),)
+    )
+
+    filled, low = 0, 2
+    if entries:
+        cached_limit, cached_path = entries[-1]
+        old = np.load(cached_path, mmap_mode="r")
+        table[: len(old)] = old
+        filled, low = len(old), cached_limit + 1
+
+    base_primes = _base_primes(math.isqrt(limit))
+    _fill_chunks(table, filled, _iter_segments(low, limit, base_primes))
+    table.flush()
+    del table
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+# ==================== ψ(x) 前缀表：素数幂与 Λ 累加和 ====================
+
+
+def _higher_prime_powers(
+    primes: np.ndarray, limit: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """primes 中各素数 ≤ limit 的k ≥ 2次幂（升序）及对应的 log p"""
+    small = primes[: np.searchsorted(primes, math.isqrt(limit), "right")].astype(
+        np.uint64
+    )
+    powers, logs = [], []
+    pk = small * small
+    while len(small):
+        powers.append(pk)
+        logs.append(np.log(small.astype(np.float64)))
+        keep = pk <= limit // small
+        small, pk = small[keep], pk[keep] * small[keep]
+    if not powers:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.float64)
+    powers, logs = np.concatenate(powers), np.concatenate(logs)
+    order = np.argsort(powers, kind="stable")
+    return powers[order], logs[order]
+
+
+def psi_prefix_table(primes: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ψ前缀表：primes 生成的 ≤ limit 的全部素数幂（升序）及 Λ 的前缀和（首项为0）
+
+    一次 O(π(limit)) 构建后，任意批样本点的 ψ(x) 由 psi_samples 二分查表得到。
+    """
+    higher, higher_logs = _higher_prime_powers(primes, limit)
+    powers = np.concatenate((primes.astype(np.uint64), higher))
+    logs = np.concatenate((np.log(primes.astype(np.float64)), higher_logs))
+    order = np.argsort(powers, kind="stable")
+    psi = np.zeros(len(powers) + 1, dtype=np.float64)
+    np.cumsum(logs[order], out=psi[1:])
+    return powers[order], psi
+
+
+def psi_samples(x, prime_powers: np.ndarray, psi_prefix: np.ndarray):
+    """ψ(x) = psi_prefix[#{素数幂 ≤ x}]，x 为标量或任意形状数组"""
+    psi = psi_prefix[np.searchsorted(prime_powers, x, "right")]
+    return float(psi) if np.ndim(psi) == 0 else psi
+
+
+# ==================== θ(x)/ψ(x) 检查点索引（磁盘持久化） ====================
+PSI_CHECKPOINT = 10**8  # 检查点间距
+PSI_SAVE_INTERVAL = 60.0  # 续建时两次落盘的最短间隔（秒）
+
+
+class PsiIndex:
+    """
+    θ(x)、ψ(x) 检查点索引：在 k·step 处保存 θ 与 ψ 的累计值，查询只筛最近检查点之后的一段
+
+    索引按 step 持久化为 psi_index_<step>.npy（形状 (K+1, 2)，列为 θ、ψ），
+    首次查询超出已建范围时从最后一个检查点流式续筛，结果逐行写入按目标
+    预分配的数组；每隔 PSI_SAVE_INTERVAL 秒及结束（含中断）时落盘（临时文件
+    +原子替换），写盘总量随续建时间线性增长，中断后可续建。
+    各检查点区间内的段和以 math.fsum 累加，
+    避免跨10^5个检查点的舍入漂移。
+    查询 θ(x) = θ(c) + Σ_{c<p≤x} log p，c为 ≤ x 的最近检查点；
+    ψ(x) - θ(x) 只涉及 √x 以内素数的高次幂，直接由小素数表求出。
+    批量查询时同一检查点区间内的样本点共用一次筛分，代价 O(样本所跨区间 × step)。
+
+    参数
+    ----------
+    step : int
+        检查点间距，默认 10^8
+    cache_dir : str
+        索引文件目录，默认 PRIME_CACHE_DIR
+    """
+
+    def __init__(self, step: int = PSI_CHECKPOINT, cache_dir: str = None):
+        self.step = step
+        self.path = os.path.join(cache_dir or PRIME_CACHE_DIR, f"psi_index_{step}.npy")
+        if os.path.exists(self.path):
+            self.checkpoints = np.load(self.path)
+        else:
+            self.checkpoints = np.zeros((1, 2), dtype=np.float64)
+
+    @property
+    def limit(self) -> int:
+        """已建索引覆盖的最大检查点"""
+        return (len(self.checkpoints) - 1) * self.step
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, self.checkpoints)
+        os.replace(tmp, self.path)
+
+    def extend_to(self, x: int) -> "PsiIndex":
+        """续建检查点直到覆盖 ⌊x/step⌋·step"""
+        target = x // self.step * self.step
+        if target <= self.limit:
+            return self
+        base_primes = _base_primes(math.isqrt(target))
+        powers, logs = _higher_prime_powers(base_primes, target)
+        higher = np.concatenate(([0.0], np.cumsum(logs)))
+        table = np.empty((target // self.step + 1, 2), dtype=np.float64)
+        filled = len(self.checkpoints)
+        table[:filled] = self.checkpoints
+        theta = float(table[filled - 1, 0])
+        last_save = time.monotonic()
+        try:
+            for k in range(filled, len(table)):
+                c = k * self.step
+                parts = [theta]
+                for primes in _iter_segments(
+                    c - self.step + 1,
+                    c,
+                    base_primes,
+                    RANGE_SEGMENT_BYTES,
+                    bucket="auto",
+                ):
+                    parts.append(float(np.log(primes.astype(np.float64)).sum()))
+                theta = math.fsum(parts)
+                table[k] = theta, theta + higher[np.searchsorted(powers, c, "right")]
+                self.checkpoints = table[: k + 1]
+                if time.monotonic() - last_save >= PSI_SAVE_INTERVAL:
+                    self._save()
+                    last_save = time.monotonic()
+        finally:
+            self._save()
+        return self
+
+    def _query(self, x, with_powers: bool):
+        x = np.asarray(x)
+        if x.dtype.kind == "f":
+            x = np.floor(x)
+        flat = np.maximum(x.astype(np.int64).ravel(), 0)
+        out = np.zeros(len(flat), dtype=np.float64)
+        if not len(flat):
+            return out.reshape(x.shape)
+        top = int(flat.max())
+        self.extend_to(top)
+        base_primes = _base_primes(math.isqrt(top))
+
+        order = np.argsort(flat, kind="stable")
+        xs = flat[order]
+        ks = xs // self.step
+        starts = np.flatnonzero(np.diff(ks, prepend=-1))
+        for lo, hi in zip(starts, np.append(starts[1:], len(xs))):
+            k = int(ks[lo])
+            group = xs[lo:hi]
+            chunks = list(
+                _iter_segments(
+                    k * self.step + 1,
+                    int(group[-1]),
+                    base_primes,
+                    RANGE_SEGMENT_BYTES,
+                    bucket="auto",
+                )
+            )
+            primes = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+            cum = np.concatenate(([0.0], np.cumsum(np.log(primes.astype(np.float64)))))
+            out[order[lo:hi]] = (
+                self.checkpoints[k, 0] + cum[np.searchsorted(primes, group, "right")]
+            )
+
+        if with_powers:
+            powers, logs = _higher_prime_powers(base_primes, top)
+            higher = np.concatenate(([0.0], np.cumsum(logs)))
+            out += higher[np.searchsorted(powers, flat, "right")]
+        return float(out[0]) if x.ndim == 0 else out.reshape(x.shape)
+
+    def theta(self, x):
+        """θ(x) = Σ_{p≤x} log p，支持数组批量查询"""
+        return self._query(x, False)
+
+    def psi(self, x):
+        """ψ(x) = Σ_{n≤x} Λ(n)，支持数组批量查询"""
+        return self._query(x, True)
+
+
+# ==================== 段长自动调优（按CPU型号持久化） ====================
+SEGMENT_CANDIDATES = {
+    "segmented": [1 << k for k in range(13, 21)],  # 8 KiB .. 1 MiB
+    "adaptive_wheel": [WHEEL_MODULUS * k for k in (8, 16, 32, 64, 156, 312)],
+}
+_TUNING_FILE = "segment_tuning.json"
+_TUNING_WINDOW = (10**9, 10**9 + (1 << 24))
+
+
+def _cpu_model() -> str:
+    """CPU型号标识（Linux读/proc/cpuinfo，其余平台退回platform信息）"""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def autotune_segment_size(
+    algorithm: str, repeats: int = 2, refresh: bool = False, cache_dir: str = None
+) -> int:
+    """
+    为本机挑选 algorithm（'segmented' 或 'adaptive_wheel'）的最佳段长
+
+    在固定窗口 [10^9, 10^9 + 2^24) 上逐个候选计时，取各自最快一次比较。
+    结果按 CPU 型号与算法写入缓存目录的 segment_tuning.json，此后直接复用。
+    """
+    cache_dir = cache_dir or PRIME_CACHE_DIR
+    path = os.path.join(cache_dir, _TUNING_FILE)
+    cpu = _cpu_model()
+    tuning = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            tuning = json.load(f)
+    if not refresh and algorithm in tuning.get(cpu, {}):
+        return tuning[cpu][algorithm]
+
+    low, high = _TUNING_WINDOW
+    base_primes = _simple_sieve(math.isqrt(high))
+    timings = {}
+    for size in SEGMENT_CANDIDATES[algorithm]:
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter_ns()
+            if algorithm == "segmented":
+                for _ in _iter_segments(low, high - 1, base_primes, size):
+                    pass
+            else:
+                for _ in iter_primes(low, high, size):
+                    pass
+            best = min(best, time.perf_counter_ns() - t0)
+        timings[size] = best
+    choice = min(timings, key=timings.get)
+
+    tuning.setdefault(cpu, {})[algorithm] = choice
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(tuning, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return choice
+
+
+def _resolve_segment_size(algorithm: str, segment_size) -> int:
+    return autotune_segment_size(algorithm) if segment_size == "auto" else segment_size
+
+
+# ==================== 多进程分段筛 ====================
+def _sieve_range_worker(task: Tuple[int, int, np.ndarray, int, bool, type]):
+    """进程池任务：筛[low, high]，返回 dtype 素数数组或素数个数"""
+    low, high, base_primes, segment_bytes, count_only, dtype = task
+    if count_only:
+        return sum(
+            len(p) for p in _iter_segments(low, high, base_primes, segment_bytes)
+        )
+    primes = np.empty(prime_count(high) - prime_count(low - 1), dtype=dtype)
+    _fill_chunks(primes, 0, _iter_segments(low, high, base_primes, segment_bytes))
+    return primes
+
+
+def parallel_segmented_sieve(
+    n: int,
+    workers: int = None,
+    count_only: bool = False,
+    segment_bytes: int = SEGMENT_BYTES,
+    dtype=None,
+):
+    """
+    多进程分段筛：√n以内基素数只算一次，[2, n]按段边界均分给各worker
+
+    count_only=False 返回按序拼接的素数数组；
+    count_only=True  返回各worker区间的素数个数列表（求和即π(n)）。
+    """
+    workers = workers or os.cpu_count() or 1
+    dtype = dtype or _prime_dtype(n)
+    if n < 2:
+        return [0] * workers if count_only else np.zeros(0, dtype=dtype)
+    base_primes = _simple_sieve(math.isqrt(n))
+
+    span = 2 * segment_bytes
+    n_spans = (n - 2) // span + 1
+    bounds = [2 + (n_spans * i // workers) * span for i in range(workers)] + [n + 1]
+    tasks = [
+        (bounds[i], bounds[i + 1] - 1, base_primes, segment_bytes, count_only, dtype)
+        for i in range(workers)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_sieve_range_worker, tasks))
+    return results if count_only else np.concatenate(results)
+
+
+# ==================== 素数模式与素数间隙扫描 ====================
+PRIME_PATTERNS = {
+    "twin": (0, 2),
+    "triplet_a": (0, 2, 6),
+    "triplet_b": (0, 4, 6),
+    "quadruplet": (0, 2, 6, 8),
+}
+
+
+def _scan_range_worker(task) -> dict:
+    """
+    扫描起点落在[low, high]内的素数模式与间隙（成员不超过stop）
+
+    每段筛出[seg_low, seg_high + reach]的位图，模式命中为各偏移切片的按位与；
+    间隙只在段内素数上做差分，记录本区间内的局部纪录间隙。
+    """
+    low, high, stop, base_primes, patterns, samples, segment_bytes = task
+    reach = max(offsets[-1] for offsets in patterns.values())
+    counts = {name: 0 for name in patterns}
+    found = {name: [] for name in patterns}
+    first = last = None
+    run_max = 0
+    records = []
+
+    span = 2 * segment_bytes
+    for seg_low in range(low, high + 1, span):
+        seg_high = min(seg_low + span - 1, high)
+        top = min(seg_high + reach, stop)
+        primes = _sieve_segment(seg_low, top, base_primes)
+        bitmap = np.zeros(top - seg_low + 1, dtype=np.bool_)
+        bitmap[primes - seg_low] = True
+
+        for name, offsets in patterns.items():
+            width = min(seg_high - seg_low + 1, len(bitmap) - offsets[-1])
+            if width <= 0:
+                continue
+            hit = bitmap[:width].copy()
+            for d in offsets[1:]:
+                hit &= bitmap[d : d + width]
+            counts[name] += int(np.count_nonzero(hit))
+            if samples is None or len(found[name]) < samples:
+                starts = (seg_low + np.flatnonzero(hit)).tolist()
+                if samples is not None:
+                    starts = starts[: samples - len(found[name])]
+                found[name].extend(tuple(p + d for d in offsets) for p in starts)
+
+        primes = primes[primes <= seg_high]
+        if not len(primes):
+            continue
+        if first is None:
+            first = int(primes[0])
+        else:
+            primes = np.concatenate(([last], primes))
+        last = int(primes[-1])
+        gaps = np.diff(primes)
+        if len(gaps):
+            prefix_max = np.maximum.accumulate(gaps)
+            before = np.concatenate(([run_max], prefix_max[:-1]))
+            is_record = gaps > before
+            records.extend(
+                zip(gaps[is_record].tolist(), primes[:-1][is_record].tolist())
+            )
+            run_max = max(run_max, int(prefix_max[-1]))
+
+    return {
+        "counts": counts,
+        "samples": found,
+        "first": first,
+        "last": last,
+        "records": records,
+    }
+
+
+def scan_prime_patterns(
+    start: int,
+    stop: int,
+    patterns: dict = None,
+    samples: int = 10,
+    workers: int = 1,
+    segment_bytes: int = SEGMENT_BYTES,
+) -> dict:
+    """
+    素数模式（孪生、两类三生、四生）与纪录间隙扫描器，不保存素数表
+
+    统计全部成员都落在[start, stop]内的各模式个数，每种保留前 samples 组
+    （None 为全部保留）；同时给出最大间隙与纪录间隙序列 [(gap, p)]，
+    p 为间隙起点素数。workers > 1 时区间切块分发到进程池，
+    各块的局部纪录按序合并：全局纪录必为其所在块的局部纪录。
+    """
+    patterns = patterns or PRIME_PATTERNS
+    base_primes = _simple_sieve(math.isqrt(max(stop, 0)))
+    start = max(start, 2)
+
+    n_tasks = workers * 4 if workers > 1 else 1
+    size = max(stop - start + 1, 0)
+    bounds = [start + size * i // n_tasks for i in range(n_tasks + 1)]
+    tasks = [
+        (
+            bounds[i],
+            bounds[i + 1] - 1,
+            stop,
+            base_primes,
+            patterns,
+            samples,
+            segment_bytes,
+        )
+        for i in range(n_tasks)
+        if bounds[i] < bounds[i + 1]
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_scan_range_worker, tasks))
+    else:
+        parts = [_scan_range_worker(task) for task in tasks]
+
+    counts = {name: 0 for name in patterns}
+    found = {name: [] for name in patterns}
+    records = []
+    run_max, prev_last = 0, None
+    for part in parts:
+        for name in patterns:
+            counts[name] += part["counts"][name]
+            found[name].extend(part["samples"][name])
+        if part["first"] is None:
+            continue
+        candidates = part["records"]
+        if prev_last is not None:
+            candidates = [(part["first"] - prev_last, prev_last)] + candidates
+        for gap, p in candidates:
+            if gap > run_max:
+                records.append((gap, p))
+                run_max = gap
+        prev_last = part["last"]
+
+    if samples is not None:
+        found = {name: found[name][:samples] for name in patterns}
+    return {
+        "counts": counts,
+        "samples": found,
+        "max_gap": records[-1] if records else None,
+        "record_gaps": records,
+    }
+
+
+# ==================== 素数计数π(x)：Lucy_Hedgehog ====================
+def prime_count(x: int) -> int:
+    """
+    Lucy_Hedgehog动态规划计算π(x) - O(x^{3/4})时间，O(√x)空间，不枚举素数
+
+    S(v) 初值为 v-1，对每个素数 p ≤ √x 执行
+        S(v) -= S(v // p) - S(p - 1)    (v ≥ p²)
+    只需在 v ∈ {x // i} 这 2√x 个点上维护：small[v] = S(v)，large[i] = S(x // i)。
+    每个 p 的更新整批向量化，右端先取旧值，等价于标量版按 v 降序更新。
+    """
+    if x < 2:
+        return 0
+    r = math.isqrt(x)
+    small = np.arange(-1, r, dtype=np.int64)  # small[v] = v - 1
+    idx = np.arange(r + 1, dtype=np.int64)
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = x // idx[1:] - 1  # large[i] = S(x // i)
+
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue
+        sp = small[p - 1]
+        p2 = p * p
+        # large：i ≤ min(r, x // p²)，x // (ip) 落在 large 或 small
+        top = min(r, x // p2)
+        i = idx[1 : top + 1]
+        ip = i * p
+        inner = ip <= r
+        sub = np.empty(top, dtype=np.int64)
+        sub[inner] = large[ip[inner]]
+        sub[~inner] = small[x // ip[~inner]]
+        large[1 : top + 1] -= sub - sp
+        # small：v ∈ [p², r]
+        if p2 <= r:
+            small[p2 : r + 1] -= small[idx[p2 : r + 1] // p] - sp
+    return int(large[1])
+
+
+# ==================== 对数积分 li(x) ====================
+def li(x, precision: str = "double"):
+    """
+    对数积分 li(x) = Ei(ln x)（主值积分 ∫₀ˣ dt/ln t，x > 0），标量或任意形状数组
+
+    precision='double'：scipy.special.expi 整批向量化，相对误差约1e-15；
+    precision='high'：逐点调用 mpmath.li（按当前 mp.dps），结果舍入为float64，
+    仅用于校验或 x 接近 li 零点（≈1.4513）时。
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if precision == "double":
+        with np.errstate(divide="ignore"):
+            values = expi(np.log(x))
+    elif precision == "high":
+        values = np.array([float(mpmath.li(v)) for v in x.ravel()]).reshape(x.shape)
+    else:
+        raise ValueError(f"未知的精度档位: {precision}")
+    return float(values) if values.ndim == 0 else values
+
+
+class LiTable:
+    """
+    li(x) 插值表：在 t = ln x 的均匀网格上预计算，查询用三次Hermite插值
+
+    节点处函数值 Ei(t) 与导数 e^t/t 均精确已知，误差约 h⁴/384（h为网格步长），
+    默认4096点覆盖 [100, 10^8] 时相对误差约1e-12。适合同一区间上反复求值。
+
+    参数
+    ----------
+    x_min : float
+        表下限（需 > 1）
+    x_max : float
+        表上限
+    size : int
+        网格点数
+    """
+
+    def __init__(self, x_min: float, x_max: float, size: int = 4096):
+        if not 1 < x_min < x_max:
+            raise ValueError("需满足 1 < x_min < x_max")
+        self.x_min, self.x_max = x_min, x_max
+        self.t = np.linspace(math.log(x_min), math.log(x_max), size)
+        self.step = self.t[1] - self.t[0]
+        self.values = expi(self.t)
+        self.slopes = np.exp(self.t) / self.t
+
+    def __call__(self, x):
+        t = np.log(np.asarray(x, dtype=np.float64))
+        if t.size and (t.min() < self.t[0] - 1e-12 or t.max() > self.t[-1] + 1e-12):
+            raise ValueError(f"x 超出插值表范围 [{self.x_min}, {self.x_max}]")
+        k = np.clip(((t - self.t[0]) / self.step).astype(np.intp), 0, len(self.t) - 2)
+        u = (t - self.t[k]) / self.step
+        u2, u3 = u * u, u * u * u
+        values = (
+            (2 * u3 - 3 * u2 + 1) * self.values[k]
+            + (u3 - 2 * u2 + u) * self.step * self.slopes[k]
+            + (-2 * u3 + 3 * u2) * self.values[k + 1]
+            + (u3 - u2) * self.step * self.slopes[k + 1]
+        )
+        return float(values) if values.ndim == 0 else values
+
+
+# ==================== 批量素性检测：确定性Miller–Rabin ====================
+MR_WITNESSES_64 = np.array(
+    [2, 325, 9375, 28178, 450775, 9780504, 1795265022], dtype=np.uint64
+)
+_TRIAL_PRIMES = _simple_sieve(1000)
+_U0, _U1, _U2 = np.uint64(0), np.uint64(1), np.uint64(2)
+
+
+@njit(cache=True)
+def _mulmod(a, b, m):
+    """(a·b) mod m，uint64无溢出：m < 2^32 直接相乘，否则倍加法"""
+    if m < np.uint64(4294967296):
+        return (a * b) % m
+    result = _U0
+    a %= m
+    while b:
+        if b & _U1:
+            result = result - (m - a) if result >= m - a else result + a
+        a = a - (m - a) if a >= m - a else a + a
+        b >>= _U1
+    return result
+
+
+@njit(cache=True)
+def _powmod(a, e, m):
+    result = _U1
+    a %= m
+    while e:
+        if e & _U1:
+            result = _mulmod(result, a, m)
+        a = _mulmod(a, a, m)
+        e >>= _U1
+    return result
+
+
+@njit(parallel=True, cache=True)
+def _miller_rabin_kernel(values, witnesses, out):
+    """对 values 逐个做确定性Miller–Rabin（调用前已排除偶数与小因子）"""
+    for i in prange(len(values)):
+        n = values[i]
+        d = n - _U1
+        s = 0
+        while (d & _U1) == _U0:
+            d >>= _U1
+            s += 1
+        prime = True
+        for a in witnesses:
+            a %= n
+            if a == _U0:
+                continue
+            x = _powmod(a, d, n)
+            if x == _U1 or x == n - _U1:
+                continue
+            for _ in range(s - 1):
+                x = _mulmod(x, x, n)
+                if x == n - _U1:
                     break
-            if is_prime:
-                primes.append(x)
-
-    if n <= modulus:
-        return sorted(set(primes))
-
-    residues = [i for i in range(1, modulus) if all(i % p != 0 for p in small_primes)]
-    seg_size = modulus * 156
-    start = modulus + 1
-
-    for low in range(start, n + 1, seg_size):
-        high = min(low + seg_size - 1, n)
-        length = high - low + 1
-        sieve = bytearray(length)
-
-        first_block = (low // modulus) * modulus
-        for k in range(first_block, high + 1, modulus):
-            for r in residues:
-                x = k + r
-                if low <= x <= high:
-                    sieve[x - low] = 1
-
-        for p in base_primes:
-            if p <= max_small or p * p > high:
+            else:
+                prime = False
+                break
+        out[i] = prime
+
+
+def is_prime_batch(values) -> np.ndarray:
+    """
+    批量素性检测：uint64数组 → bool数组，对全部 n < 2^64 确定
+
+    1. 向量化试除：用1000以内的素数整批取模，排除绝大多数合数；
+       n < 1000² 且无小因子者即为素数
+    2. 其余候选交给Numba并行的Miller–Rabin，见证集
+       {2, 325, 9375, 28178, 450775, 9780504, 1795265022} 覆盖全部64位整数
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    result = values >= 2
+    undecided = result.copy()
+    for p in _TRIAL_PRIMES.tolist():
+        divisible = values % np.uint64(p) == 0
+        result &= ~divisible | (values == p)
+        undecided &= ~divisible
+    undecided &= values >= np.uint64(1000 * 1000)
+
+    idx = np.flatnonzero(undecided)
+    if len(idx):
+        out = np.empty(len(idx), dtype=np.bool_)
+        _miller_rabin_kernel(values[idx], MR_WITNESSES_64, out)
+        result[idx] = out
+    return result
+
+
+# ==================== 线性筛：最小素因子表与批量分解 ====================
+SPF_SEGMENT = 1 << 20  # 最小素因子表分段填充/区间分解的段长（个数）
+
+
+@njit(cache=True)
+def _linear_sieve_kernel(n, n_primes):
+    """Euler线性筛编译内核：每个合数只被其最小素因子划掉一次"""
+    spf = np.zeros(n + 1, dtype=np.uint32)
+    primes = np.empty(n_primes, dtype=np.uint32)
+    count = 0
+    for i in range(2, n + 1):
+        if spf[i] == 0:
+            spf[i] = i
+            primes[count] = i
+            count += 1
+        for j in range(count):
+            p = primes[j]
+            if p > spf[i] or i * p > n:
+                break
+            spf[i * p] = p
+    return spf, primes
+
+
+def linear_sieve(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    线性筛（Euler筛）- O(n)时间，返回 (spf, primes)
+
+    spf[k] 为k的最小素因子（uint32，spf[0] = spf[1] = 0，素数处为自身），
+    primes 为[2, n]内的素数（uint32）。要求 n < 2^32。
+    """
+    if n >= 1 << 32:
+        raise ValueError(f"uint32最小素因子表无法容纳 n={n}")
+    n = max(n, 1)
+    return _linear_sieve_kernel(n, prime_count(n))
+
+
+@njit(parallel=True, cache=True)
+def _spf_fill_kernel(spf, lo, seg_len, primes):
+    """prange分段填充 spf[lo:]：段内按基素数升序写入首个命中的素因子"""
+    n = len(spf)
+    n_seg = (n - lo + seg_len - 1) // seg_len
+    for s in prange(n_seg):
+        start = lo + s * seg_len
+        end = min(start + seg_len, n)
+        spf[start:end] = 0
+        for j in range(len(primes)):
+            p = np.int64(primes[j])
+            if p * p >= end:
+                break
+            for k in range(max(p * p, (start + p - 1) // p * p), end, p):
+                if spf[k] == 0:
+                    spf[k] = p
+        for k in range(start, end):
+            if spf[k] == 0:
+                spf[k] = k
+
+
+def spf_table(n: int, segment_size: int = SPF_SEGMENT) -> np.ndarray:
+    """
+    [0, n]的最小素因子表（uint32，约 4n 字节）
+
+    √n以内由线性筛直接构建；其余部分按 segment_size 分段，各段只用
+    √n以内的基素数在段内划分，访存局限于单段（线性筛对整表随机写，
+    n较大时缓存命中率很差），各段在prange中并行填充。
+    """
+    if n >= 1 << 32:
+        raise ValueError(f"uint32最小素因子表无法容纳 n={n}")
+    if n <= segment_size:
+        return linear_sieve(n)[0]
+    spf_head, base_primes = linear_sieve(max(math.isqrt(n), segment_size))
+    spf = np.empty(n + 1, dtype=np.uint32)
+    spf[: len(spf_head)] = spf_head
+    _spf_fill_kernel(spf, len(spf_head), segment_size, base_primes)
+    return spf
+
+
+@njit(cache=True)
+def _factor_counts(values, spf):
+    counts = np.zeros(len(values), dtype=np.int64)
+    for i in range(len(values)):
+        m, last = values[i], 0
+        while m > 1:
+            p = np.int64(spf[m])
+            if p != last:
+                counts[i] += 1
+                last = p
+            m //= p
+    return counts
+
+
+@njit(cache=True)
+def _factor_fill(values, spf, offsets, primes, exponents):
+    for i in range(len(values)):
+        m, last, k = values[i], 0, offsets[i] - 1
+        while m > 1:
+            p = np.int64(spf[m])
+            if p != last:
+                k += 1
+                primes[k] = p
+                exponents[k] = 0
+                last = p
+            exponents[k] += 1
+            m //= p
+
+
+def factorize_batch(
+    values, spf: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量质因数分解：沿最小素因子表逐级除尽，每个数 O(Ω(n)) 次查表
+
+    返回CSR形式 (offsets, primes, exponents)：values[i] 的素因子为
+    primes[offsets[i]:offsets[i+1]]（升序），对应指数在 exponents 中。
+    spf 缺省时按 max(values) 现建；values 需在 [1, len(spf)) 内。
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) and values.min() < 1:
+        raise ValueError("factorize_batch 仅接受正整数")
+    if spf is None:
+        spf = spf_table(int(values.max()) if len(values) else 1)
+    if len(values) and values.max() >= len(spf):
+        raise ValueError(f"{int(values.max())} 超出最小素因子表上限 {len(spf) - 1}")
+
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(_factor_counts(values, spf), out=offsets[1:])
+    primes = np.empty(offsets[-1], dtype=np.uint32)
+    exponents = np.empty(offsets[-1], dtype=np.uint8)
+    _factor_fill(values, spf, offsets, primes, exponents)
+    return offsets, primes, exponents
+
+
+# ==================== 分段算术函数筛：Λ、μ、φ、d、σ ====================
+ARITH_BLOCK = 1 << 24  # iter_arithmetic 每次产出的区间长度（个数）
+ARITH_FUNCTIONS = {
+    # 名称: (dtype, 前缀和名称)
+    "Lambda": (np.float64, "psi"),
+    "mu": (np.int8, "M"),
+    "phi": (np.int64, "Phi"),
+    "d": (np.int32, None),
+    "sigma": (np.int64, None),
+    "omega": (np.uint8, None),
+    "Omega": (np.uint8, None),
+}
+
+
+@njit(cache=True)
+def _arith_segment(lo, n, primes, lam, mu, phi, d, sigma, small, big):
+    """
+    区间[lo, lo+n)上的算术函数：只做乘法，仅素数幂层做小整数除法
+
+    每个基素数p先划过其倍数（指数1），再依次划过 p², p³, … 的倍数，
+    第e层把各函数在 p^(e-1) 处的因子换成 p^e 处的因子，同时把p累乘进
+    prod；Λ 只在 p^e 本身落入区间时置 log p。最后 prod ≠ n 者恰好还剩
+    一个大于√hi的素因子 n/prod。长度为0的输出数组表示不计算该函数。
+    """
+    hi = lo + n
+    prod = np.ones(n, dtype=np.int64)
+    lam[:] = 0.0
+    mu[:] = 1
+    phi[:] = 1
+    d[:] = 1
+    sigma[:] = 1
+    small[:] = 0
+    big[:] = 0
+    has_lam, has_mu, has_phi, has_d = (
+        len(lam) > 0,
+        len(mu) > 0,
+        len(phi) > 0,
+        len(d) > 0,
+    )
+    has_sigma, has_small, has_big = len(sigma) > 0, len(small) > 0, len(big) > 0
+    for j in range(len(primes)):
+        p = np.int64(primes[j])
+        if p * p >= hi:
+            break
+        for k in range((lo + p - 1) // p * p - lo, n, p):
+            prod[k] *= p
+            if has_mu:
+                mu[k] = -mu[k]
+            if has_phi:
+                phi[k] *= p - 1
+            if has_d:
+                d[k] *= 2
+            if has_sigma:
+                sigma[k] *= p + 1
+            if has_small:
+                small[k] += 1
+            if has_big:
+                big[k] += 1
+        if has_lam and lo <= p < hi:
+            lam[p - lo] = math.log(p)
+        q, e, sq_prev = p, 1, p + 1
+        while q <= (hi - 1) // p:
+            q *= p
+            e += 1
+            sq = sq_prev + q
+            for k in range((lo + q - 1) // q * q - lo, n, q):
+                prod[k] *= p
+                if has_mu:
+                    mu[k] = 0
+                if has_phi:
+                    phi[k] *= p
+                if has_d:
+                    d[k] = d[k] // e * (e + 1)
+                if has_sigma:
+                    sigma[k] = sigma[k] // sq_prev * sq
+                if has_big:
+                    big[k] += 1
+            if has_lam and lo <= q:
+                lam[q - lo] = math.log(p)
+            sq_prev = sq
+    for k in range(n):
+        m = lo + k
+        if m > 1 and prod[k] != m:
+            rest = m // prod[k]
+            if has_lam and prod[k] == 1:
+                lam[k] = math.log(m)
+            if has_mu:
+                mu[k] = -mu[k]
+            if has_phi:
+                phi[k] *= rest - 1
+            if has_d:
+                d[k] *= 2
+            if has_sigma:
+                sigma[k] *= rest + 1
+            if has_small:
+                small[k] += 1
+            if has_big:
+                big[k] += 1
+
+
+@njit(parallel=True, cache=True)
+def _arith_kernel(lo, n, seg_len, primes, lam, mu, phi, d, sigma, small, big):
+    """prange分段计算，各段写入输出数组的不相交切片（空数组原样传递）"""
+    for s in prange((n + seg_len - 1) // seg_len):
+        a = s * seg_len
+        b = min(a + seg_len, n)
+        _arith_segment(
+            lo + a,
+            b - a,
+            primes,
+            lam[a:b],
+            mu[a:b],
+            phi[a:b],
+            d[a:b],
+            sigma[a:b],
+            small[a:b],
+            big[a:b],
+        )
+
+
+def _arith_fill(
+    lo: int, n: int, base_primes: np.ndarray, functions, segment_size: int
+) -> dict:
+    """计算[lo, lo+n)上 functions 中各函数，返回 {名称: 数组}"""
+    arrays = {
+        name: np.empty(n if name in functions else 0, dtype=dtype)
+        for name, (dtype, _) in ARITH_FUNCTIONS.items()
+    }
+    _arith_kernel(lo, n, segment_size, base_primes, *arrays.values())
+    return {name: arrays[name] for name in functions}
+
+
+def iter_arithmetic(
+    a: int,
+    b: int,
+    functions=("Lambda", "mu"),
+    block_size: int = ARITH_BLOCK,
+    segment_size: int = SPF_SEGMENT,
+):
+    """
+    分段算术函数筛：按块产出[a, b)上的 Λ(n)、μ(n)、φ(n)、d(n)、σ(n)、ω(n)、Ω(n)
+
+    每块为一个dict：'lo' 为块起点，各函数数组按 ARITH_FUNCTIONS 的dtype
+    （Λ为float64，μ为int8，φ、σ为int64，d为int32）；同时给出跨块延续的
+    前缀和 'psi'（ΣΛ）、'M'（Σμ）、'Phi'（Σφ），均从a起累计，a=1 时即
+    ψ(n)、M(n)、Φ(n)。'Phi' 在累计值不超过int64时为精确的int64
+    （Φ(x) ≈ 3x²/π²，约 x ≈ 5.5×10^9 前）；此后的块改为float64，只是近似值，
+    任何时候精确的整数累计值都在 'totals' 中。
+    基素数（√b以内）由线性筛一次求出，内存只与 block_size 有关，
+    可流式累计到10^11以上。要求 1 ≤ a ≤ b < 2^63。
+    """
+    unknown = set(functions) - set(ARITH_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"未知的算术函数: {sorted(unknown)}")
+    if not 1 <= a <= b < 1 << 63:
+        raise ValueError("需满足 1 ≤ a ≤ b < 2^63")
+    base_primes = linear_sieve(math.isqrt(max(b - 1, 1)))[1]
+    totals = {
+        ARITH_FUNCTIONS[name][1]: 0 for name in functions if ARITH_FUNCTIONS[name][1]
+    }
+    for lo in range(a, b, block_size):
+        block = _arith_fill(
+            lo, min(block_size, b - lo), base_primes, functions, segment_size
+        )
+        block["lo"] = lo
+        for name in functions:
+            prefix = ARITH_FUNCTIONS[name][1]
+            if prefix is None:
                 continue
-            start_mark = ((low + p - 1) // p) * p
-            if start_mark < p * p:
-                start_mark = p * p
-            for j in range(start_mark, high + 1, p):
-                if j >= low:
-                    sieve[j - low] = 0
+            values = block[name]
+            if prefix == "psi":
+                block[prefix] = np.cumsum(values) + totals[prefix]
+                totals[prefix] = float(block[prefix][-1])
+            elif prefix == "M":
+                block[prefix] = np.cumsum(values, dtype=np.int64) + totals[prefix]
+                totals[prefix] = int(block[prefix][-1])
+            else:
+                end = totals[prefix] + int(values.sum(dtype=np.uint64))
+                if end < 1 << 63:
+                    block[prefix] = np.cumsum(values, dtype=np.int64) + totals[prefix]
+                else:
+                    block[prefix] = (
+                        np.cumsum(values, dtype=np.float64) + totals[prefix]
+                    )
+                totals[prefix] = end
+        block["totals"] = dict(totals)
+        yield block
+
+
+def omega_mu_range(
+    a: int, b: int, segment_size: int = SPF_SEGMENT
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    区间[a, b)上的 Ω(n)、ω(n)、μ(n)，返回 (uint8, uint8, int8) 三个数组
+
+    基素数取自线性筛（√b以内），按 segment_size 分段在prange中并行划分，
+    不需要覆盖到b的最小素因子表，10^9长度的区间也只占输出数组的内存。
+    要求 1 ≤ a ≤ b < 2^63。
+    """
+    if not 1 <= a <= b < 1 << 63:
+        raise ValueError("需满足 1 ≤ a ≤ b < 2^63")
+    base_primes = linear_sieve(math.isqrt(max(b - 1, 1)))[1]
+    values = _arith_fill(a, b - a, base_primes, ("Omega", "omega", "mu"), segment_size)
+    return values["Omega"], values["omega"], values["mu"]
+
+
+# ==================== 紧凑素数位图：30-wheel ====================
+_WHEEL30_BIT = np.full(30, -1, dtype=np.int64)
+_WHEEL30_BIT[WHEEL30] = np.arange(8)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def _mark_bitmap30(bits: np.ndarray, primes: np.ndarray) -> None:
+    """把一段升序素数（均 ≥ 7）按位或进30-wheel位图"""
+    if not len(primes):
+        return
+    byte = primes // 30
+    b0 = int(byte[0])
+    masks = np.left_shift(1, _WHEEL30_BIT[primes % 30])
+    bits[b0 : int(byte[-1]) + 1] |= np.bincount(byte - b0, weights=masks).astype(
+        np.uint8
+    )
+
+
+class PrimeBitmap30:
+    """
+    30-wheel位压缩素数表：每30个整数只保留与30互素的8个余数，占1字节
+
+    第k字节的第j位表示 30k + WHEEL30[j] 是否为素数；2、3、5单独处理。
+    相比list[bool]（每个数8字节指针）内存约降至1/240，10^10全表约333 MB。
+
+    参数
+    ----------
+    limit : int
+        位图覆盖的上限（含）
+    bits : np.ndarray
+        uint8位图，长度 limit // 30 + 1
+    """
+
+    SMALL = (2, 3, 5)
+
+    def __init__(self, limit: int, bits: np.ndarray):
+        self.limit = limit
+        self.bits = bits
+
+    @classmethod
+    def from_limit(cls, n: int, segment_bytes: int = SEGMENT_BYTES) -> "PrimeBitmap30":
+        """分段筛构建[0, n]的位图，峰值内存 O(n/30 + 段长)"""
+        bits = np.zeros(max(n, 0) // 30 + 1, dtype=np.uint8)
+        base_primes = _simple_sieve(math.isqrt(max(n, 0)))
+        for primes in _iter_segments(7, n, base_primes, segment_bytes):
+            _mark_bitmap30(bits, primes)
+        return cls(n, bits)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def is_prime(self, x: int) -> bool:
+        """O(1)查询x是否为素数（x需 ≤ limit）"""
+        if x > self.limit:
+            raise ValueError(f"{x} 超出位图上限 {self.limit}")
+        if x < 7:
+            return x in self.SMALL
+        bit = _WHEEL30_BIT[x % 30]
+        return bit >= 0 and bool((self.bits[x // 30] >> bit) & 1)
+
+    def _decode(self, byte_lo: int, byte_hi: int) -> np.ndarray:
+        """解码第[byte_lo, byte_hi)字节中的素数（升序）"""
+        unpacked = np.unpackbits(
+            self.bits[byte_lo:byte_hi, None], axis=1, bitorder="little"
+        )
+        rows, cols = np.nonzero(unpacked)
+        return 30 * (byte_lo + rows.astype(np.int64)) + WHEEL30[cols]
+
+    def count(self, a: int, b: int) -> int:
+        """统计[a, b]内的素数个数：整字节查表popcount，仅两端字节解码"""
+        a, b = max(a, 0), min(b, self.limit)
+        if a > b:
+            return 0
+        total = sum(1 for p in self.SMALL if a <= p <= b)
+        lo, hi = a // 30, b // 30 + 1
+        total += int(_POPCOUNT[self.bits[lo:hi]].sum())
+        edges = self._decode(lo, lo + 1)
+        total -= int(np.count_nonzero(edges < a))
+        edges = self._decode(hi - 1, hi)
+        total -= int(np.count_nonzero(edges > b))
+        return total
+
+    def iter_primes(self, a: int, b: int, chunk_bytes: int = SEGMENT_BYTES):
+        """按块产出[a, b]内的素数数组（升序），每块解码 chunk_bytes 个字节"""
+        a, b = max(a, 0), min(b, self.limit)
+        if a > b:
+            return
+        small = [p for p in self.SMALL if a <= p <= b]
+        if small:
+            yield np.array(small, dtype=np.int64)
+        for lo in range(a // 30, b // 30 + 1, chunk_bytes):
+            primes = self._decode(lo, min(lo + chunk_bytes, b // 30 + 1))
+            primes = primes[(primes >= a) & (primes <= b)]
+            if len(primes):
+                yield primes
+
+
+class PrimeSieve:
+    """
+    可增量扩展的素数筛：保留当前上限与30-wheel位图，跨请求复用
+
+    extend_to(m) 只筛新增区间 (limit, m]，基素数优先从已有位图解码，
+    旧区间不再重复筛。扩展时在新数组上完成筛分后整体替换位图引用，
+    已发布的位图从不原地修改，读操作取一次快照即可无锁并发；
+    写操作（扩展）由互斥锁串行化。查询超出上限时按至少翻倍自动扩展。
 
-        for k in range(first_block, high + 1, modulus):
-            for r in residues:
-                x = k + r
-                if low <= x <= high and sieve[x - low]:
-                    primes.append(x)
+    参数
+    ----------
+    limit : int
+        初始筛分上限（含）
+    segment_bytes : int
+        扩展时的分段长度（字节）
+    """
 
-    return sorted(set(primes))
+    def __init__(self, limit: int = 0, segment_bytes: int = SEGMENT_BYTES):
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._bitmap = PrimeBitmap30(0, np.zeros(1, dtype=np.uint8))
+        self.extend_to(limit)
+
+    @property
+    def limit(self) -> int:
+        return self._bitmap.limit
+
+    @property
+    def bitmap(self) -> PrimeBitmap30:
+        """当前位图快照（只读）"""
+        return self._bitmap
+
+    def _base_primes(self, limit: int) -> np.ndarray:
+        """[2, limit]内的基素数：已筛过则直接从位图解码"""
+        bitmap = self._bitmap
+        if limit > bitmap.limit:
+            return _simple_sieve(limit)
+        chunks = list(bitmap.iter_primes(2, limit))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+    def extend_to(self, m: int) -> "PrimeSieve":
+        """把筛分上限扩展到m，仅筛 (limit, m]"""
+        with self._lock:
+            old = self._bitmap
+            if m <= old.limit:
+                return self
+            bits = np.zeros(m // 30 + 1, dtype=np.uint8)
+            bits[: len(old.bits)] = old.bits
+            base_primes = self._base_primes(math.isqrt(m))
+            for primes in _iter_segments(
+                max(old.limit + 1, 7), m, base_primes, self.segment_bytes
+            ):
+                _mark_bitmap30(bits, primes)
+            self._bitmap = PrimeBitmap30(m, bits)
+        return self
+
+    def _covering(self, x: int) -> PrimeBitmap30:
+        """返回覆盖x的位图快照，不足时自动扩展"""
+        bitmap = self._bitmap
+        if x > bitmap.limit:
+            self.extend_to(max(x, 2 * bitmap.limit))
+            bitmap = self._bitmap
+        return bitmap
+
+    def is_prime(self, x: int) -> bool:
+        return self._covering(x).is_prime(x)
+
+    def count(self, a: int, b: int) -> int:
+        """统计[a, b]内的素数个数"""
+        return self._covering(b).count(a, b)
+
+    def iter_primes(self, a: int, b: int, chunk_bytes: int = SEGMENT_BYTES):
+        """按块产出[a, b]内的素数数组（升序）"""
+        return self._covering(b).iter_primes(a, b, chunk_bytes)
+
+    def primes(self, a: int, b: int, dtype=None) -> np.ndarray:
+        """[a, b]内的全部素数，按 prime_count 预分配的 dtype 数组"""
+        bitmap = self._covering(b)
+        out = np.empty(bitmap.count(a, b), dtype=dtype or _prime_dtype(b))
+        _fill_chunks(out, 0, bitmap.iter_primes(a, b))
+        return out
 
 
 # ==================== 测试框架 ====================
@@ -240,10 +1808,11 @@ def benchmark(algorithms: List[Tuple[str, callable]], test_cases: List[int]) ->
     for n in test_cases:
         line = f"1-{n:<8}"
         results = []
-        reference_count = None
+        reference_count = prime_count(n)
 
         for name, func in algorithms:
             try:
+                func(min(n, 1000))  # 预热：触发numba编译/加载缓存，不计入测量
                 tracemalloc.start()
                 t0 = time.time()
                 primes = func(n)
@@ -254,12 +1823,8 @@ def benchmark(algorithms: List[Tuple[str, callable]], test_cases: List[int]) ->
                 peak_mb = peak / (1024 * 1024)
                 count = len(primes)
 
-                # 结果验证
-                if reference_count is None:
-                    reference_count = count
-                    status = f"{count:,}"
-                else:
-                    status = f"{count:,}" if count == reference_count else f"{count:,}✗"
+                # 结果验证（参考值由prime_count独立给出）
+                status = f"{count:,}" if count == reference_count else f"{count:,}✗"
 
                 results.append((name, elapsed, peak_mb, count))
                 line += f"{elapsed:>8.2f}{peak_mb:>10.2f}{status:>10}"
@@ -272,10 +1837,198 @@ def benchmark(algorithms: List[Tuple[str, callable]], test_cases: List[int]) ->
                 line += f"{'[ERR]':>8}{'':>10}{'[ERR]':>10}"
 
         print(line)
-        if reference_count:
-            print(f"  参考素数个数: {reference_count:,} (π({n}))")
+        print(f"  参考素数个数: {reference_count:,} (π({n})，Lucy_Hedgehog)")
+
+    print()
+
+
+def _bench_measure(mode: str, func, n: int, warmup: int, repeats: int) -> dict:
+    """mode='time' 只计时（无tracemalloc），mode='memory' 只测峰值RSS"""
+    if mode == "time":
+        for _ in range(warmup):
+            func(n)
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter_ns()
+            primes = func(n)
+            times.append(time.perf_counter_ns() - t0)
+        return {"times_ns": times, "count": len(primes)}
+
+    import resource  # 仅Unix可用，只在子进程中导入
+
+    func(min(n, 1000))  # 预热：numba编译/加载缓存的内存不计入增量
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    primes = func(n)
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "peak_rss_kb": rss_peak,
+        "rss_delta_kb": rss_peak - rss_before,
+        "count": len(primes),
+    }
+
+
+def _bench_worker(mode: str, func, n: int, warmup: int, repeats: int, queue) -> None:
+    """子进程任务：测量结果或错误记录放入队列"""
+    try:
+        queue.put(_bench_measure(mode, func, n, warmup, repeats))
+    except MemoryError:
+        queue.put({"error": "oom", "detail": "MemoryError"})
+    except Exception as e:
+        queue.put({"error": "error", "detail": f"{type(e).__name__}: {e}"})
 
+
+def _run_isolated(
+    mode: str, func, n: int, warmup: int = 0, repeats: int = 1, timeout: float = None
+) -> dict:
+    """
+    在全新的spawn子进程中执行一次测量，避免前序算法的堆残留污染RSS
+
+    子进程异常时返回 {"error": "error"|"oom", "detail": ...}；被 SIGKILL
+    （通常是OOM killer）或其他原因无结果退出、以及超过 timeout 秒时同样返回错误记录。
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(
+        target=_bench_worker, args=(mode, func, n, warmup, repeats, queue)
+    )
+    proc.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except Empty:
+            if not proc.is_alive():
+                # 退出前写入的结果可能仍在管道中，再取一次
+                try:
+                    result = queue.get(timeout=1.0)
+                except Empty:
+                    killed = proc.exitcode == -getattr(signal, "SIGKILL", 9)
+                    result = {
+                        "error": "oom" if killed else "error",
+                        "detail": f"子进程退出码 {proc.exitcode}",
+                    }
+            elif deadline is not None and time.monotonic() > deadline:
+                proc.terminate()
+                result = {"error": "error", "detail": f"超时（{timeout}s）"}
+    proc.join()
+    return result
+
+
+def rigorous_benchmark(
+    algorithms: List[Tuple[str, callable]],
+    test_cases: List[int],
+    repeats: int = 5,
+    warmup: int = 1,
+    output: str = None,
+    baseline: str = None,
+    threshold: float = 0.10,
+    timeout: float = None,
+) -> dict:
+    """
+    严格基准测试：计时与内存分两轮、每次测量独立子进程
+
+    - 计时轮：perf_counter_ns，先预热 warmup 次再重复 repeats 次，取中位数
+    - 内存轮：单独子进程运行一次，报告 ru_maxrss 峰值与调用前后的增量
+    - 正确性：素数个数与 prime_count(n) 比对
+    - 标度指数：对各 test_cases 的中位时间做 log t = k·log n + c 拟合
+    - 基线：与 baseline JSON 对比，中位时间变慢超过 threshold 即标记回退
+    - 失败：子进程异常、被杀（OOM）或超过 timeout 秒时记为 error/oom，不中断整轮
+    结果可写入 output JSON。
+    """
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "repeats": repeats,
+            "warmup": warmup,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+        "scaling": {},
+        "regressions": [],
+    }
+
+    print("=" * 100)
+    print(f"严格基准测试（重复{repeats}次 + 预热{warmup}次，子进程隔离）")
+    print("=" * 100)
+    print(
+        f"{'算法':<12}{'范围':>14}{'中位(s)':>12}{'最快(s)':>12}"
+        f"{'峰值RSS(MB)':>14}{'增量(MB)':>12}{'验证':>8}"
+    )
+    print("-" * 100)
+
+    for name, func in algorithms:
+        report["results"][name] = {}
+        for n in test_cases:
+            timing = _run_isolated("time", func, n, warmup, repeats, timeout)
+            memory = _run_isolated("memory", func, n, timeout=timeout)
+            failed = timing if "error" in timing else memory
+            if "error" in failed:
+                report["results"][name][str(n)] = failed
+                tag = "[OOM]" if failed["error"] == "oom" else "[ERR]"
+                print(f"{name:<12}{n:>14,}{tag:>12}  {failed['detail']}")
+                continue
+            times_s = np.array(timing["times_ns"]) / 1e9
+            entry = {
+                "times_ns": timing["times_ns"],
+                "median_s": float(np.median(times_s)),
+                "min_s": float(times_s.min()),
+                "peak_rss_mb": memory["peak_rss_kb"] / 1024,
+                "rss_delta_mb": memory["rss_delta_kb"] / 1024,
+                "count": timing["count"],
+                "correct": timing["count"] == prime_count(n),
+            }
+            report["results"][name][str(n)] = entry
+            print(
+                f"{name:<12}{n:>14,}{entry['median_s']:>12.4f}{entry['min_s']:>12.4f}"
+                f"{entry['peak_rss_mb']:>14.1f}{entry['rss_delta_mb']:>12.1f}"
+                f"{'✓' if entry['correct'] else '✗':>8}"
+            )
+
+        ok = [
+            (n, e["median_s"])
+            for n, e in report["results"][name].items()
+            if "error" not in e
+        ]
+        if len(ok) >= 2:
+            ns, medians = zip(*ok)
+            slope = np.polyfit(np.log(np.array(ns, dtype=float)), np.log(medians), 1)[0]
+            report["scaling"][name] = float(slope)
+
+    print("\n标度指数（t ∝ n^k）：")
+    for name, k in report["scaling"].items():
+        print(f"  {name:<12} k = {k:.3f}")
+
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as f:
+            base = json.load(f)["results"]
+        for name, cases in report["results"].items():
+            for n, entry in cases.items():
+                ref = base.get(name, {}).get(n)
+                if ref is None or "error" in ref or "error" in entry:
+                    continue
+                ratio = entry["median_s"] / ref["median_s"]
+                if ratio > 1 + threshold:
+                    report["regressions"].append(
+                        {"algorithm": name, "n": int(n), "ratio": ratio}
+                    )
+        print(f"\n基线对比（阈值 +{threshold:.0%}）：", end="")
+        if report["regressions"]:
+            print()
+            for r in report["regressions"]:
+                print(f"  ✗ {r['algorithm']} n={r['n']:,} 变慢 {r['ratio']:.2f}x")
+        else:
+            print("无回退")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {output}")
     print()
+    return report
 
 
 def theoretical_comparison() -> None:
@@ -357,8 +2110,19 @@ def feature_comparison() -> None:
 
 
 if __name__ == "__main__":
-    theoretical_comparison()
-    feature_comparison()
+    parser = argparse.ArgumentParser(description="素数生成算法对比")
+    parser.add_argument(
+        "--rigorous", action="store_true", help="子进程隔离的多次重复基准"
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--json", dest="output", help="结果JSON输出路径")
+    parser.add_argument("--baseline", help="基线JSON路径，用于回退检测")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="回退阈值（相对变慢比例）"
+    )
+    parser.add_argument("--timeout", type=float, help="单次子进程测量的超时（秒）")
+    args = parser.parse_args()
 
     algorithms = [
         ("试除法", trial_division),
@@ -366,7 +2130,25 @@ if __name__ == "__main__":
         ("分段筛", segmented_sieve),
         ("标准Wheel", standard_wheel_sieve),
         ("自适应wheel", adaptive_wheel_sieve),
+        ("分段筛[numba]", partial(segmented_sieve, backend="numba")),
+        ("标准Wheel[numba]", partial(standard_wheel_sieve, backend="numba")),
+        ("自适应wheel[numba]", partial(adaptive_wheel_sieve, backend="numba")),
     ]
 
     test_cases = [100_000, 500_000, 1_000_000, 10_000_000]
-    benchmark(algorithms, test_cases)
+
+    if args.rigorous:
+        rigorous_benchmark(
+            algorithms,
+            test_cases,
+            repeats=args.repeats,
+            warmup=args.warmup,
+            output=args.output,
+            baseline=args.baseline,
+            threshold=args.threshold,
+            timeout=args.timeout,
+        )
+    else:
+        theoretical_comparison()
+        feature_comparison()
+        benchmark(algorithms, test_cases)